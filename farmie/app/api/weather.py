@@ -110,10 +110,9 @@ async def get_weather_summary(
     try:
         logger.info(f"Fetching weather summary for lat: {latitude}, lon: {longitude}")
         
-        # Fetch all weather data
-        current_weather = weather_service.get_weather_data(latitude, longitude)
+        # Fetch all weather data (current conditions and air quality concurrently)
+        current_weather, air_quality = weather_service.get_weather_bundle(latitude, longitude)
         forecast = weather_service.get_weather_forecast(latitude, longitude, 3)  # 3-day forecast
-        air_quality = weather_service.get_air_quality(latitude, longitude)
         
         # Calculate summary statistics
         forecast_temps = [day['temperature'] for day in forecast[:8]]  # Next 24 hours
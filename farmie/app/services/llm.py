@@ -1,24 +1,31 @@
 import os
 import json
 import logging
+import importlib.util
+import time
+from functools import cached_property
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
-# Optional imports for LLM services
+# Optional fast JSON decoding
 try:
-    import openai
-    OPENAI_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
 except ImportError:
-    OPENAI_AVAILABLE = False
+    _json_loads = json.loads
+
+# Optional LLM libraries, probed here but only imported when a client is first used
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+if not OPENAI_AVAILABLE:
     logging.warning("OpenAI not available - LLM insights will use fallback")
 
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
+if not GEMINI_AVAILABLE:
     logging.warning("Google Gemini not available - LLM insights will use fallback")
 
 # Load environment variables
@@ -28,40 +35,107 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _TimeCache:
+    """ISO timestamp memoized at ~100ms granularity for batch insight paths"""
+    __slots__ = ('ts', 'expires')
+    
+    def __init__(self):
+        self.ts = ''
+        self.expires = 0.0
+    
+    def now_iso(self) -> str:
+        t = time.monotonic()
+        if t > self.expires:
+            self.ts = datetime.utcnow().isoformat()
+            self.expires = t + 0.1
+        return self.ts
+
+
+_tc = _TimeCache()
+
+_SYSTEM_PROMPT = "You are an expert agricultural consultant providing insights based on farm sensor data and ML predictions."
+
+_PROMPT_TEMPLATES = {
+    "irrigation": """
+    Based on the farm sensor data and ML prediction, provide irrigation recommendations.
+    Include:
+    1. Whether irrigation is needed and why
+    2. Specific recommendations for irrigation timing and amount
+    3. Any warnings about over/under irrigation
+    4. Weather considerations
+    
+    Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
+    """,
+    "crop_health": """
+    Based on the farm sensor data and ML prediction, provide crop health insights.
+    Include:
+    1. Assessment of current crop health
+    2. Factors affecting crop health
+    3. Recommendations for improvement
+    4. Potential issues to watch for
+    
+    Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
+    """,
+    "yield": """
+    Based on the farm sensor data and ML prediction, provide yield insights.
+    Include:
+    1. Yield prediction analysis
+    2. Factors influencing yield
+    3. Recommendations to optimize yield
+    4. Risk factors affecting yield
+    
+    Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
+    """
+}
+
+# Static chat prefixes per insight type; keeping them identical across calls
+# lets the provider reuse its prompt cache and only the context varies.
+_PREFIX_MESSAGES = {
+    insight_type: (
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": template},
+    )
+    for insight_type, template in _PROMPT_TEMPLATES.items()
+}
+
 
 class LLMService:
     """Service for generating insights using LLM APIs"""
     
-    def __init__(self):
-        self.openai_client = None
-        self.gemini_model = None
-        self._initialize_clients()
-    
-    def _initialize_clients(self):
-        """Initialize LLM clients"""
-        # Initialize OpenAI
-        if OPENAI_AVAILABLE:
-            openai_api_key = os.getenv('OPENAI_API_KEY')
-            if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-                openai.api_key = openai_api_key
-                self.openai_client = openai.OpenAI(api_key=openai_api_key)
-                logger.info("OpenAI client initialized")
-            else:
-                logger.warning("OpenAI API key not found or not configured")
-        else:
+    @cached_property
+    def openai_client(self):
+        """OpenAI client, created on first use"""
+        if not OPENAI_AVAILABLE:
             logger.warning("OpenAI library not available")
+            return None
         
-        # Initialize Gemini
-        if GEMINI_AVAILABLE:
-            google_api_key = os.getenv('GOOGLE_API_KEY')
-            if google_api_key and google_api_key != 'your_google_api_key_here':
-                genai.configure(api_key=google_api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini client initialized")
-            else:
-                logger.warning("Google API key not found or not configured")
-        else:
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        if not openai_api_key or openai_api_key == 'your_openai_api_key_here':
+            logger.warning("OpenAI API key not found or not configured")
+            return None
+        
+        import openai
+        client = openai.OpenAI(api_key=openai_api_key)
+        logger.info("OpenAI client initialized")
+        return client
+    
+    @cached_property
+    def gemini_model(self):
+        """Gemini model, configured on first use"""
+        if not GEMINI_AVAILABLE:
             logger.warning("Google Gemini library not available")
+            return None
+        
+        google_api_key = os.getenv('GOOGLE_API_KEY')
+        if not google_api_key or google_api_key == 'your_google_api_key_here':
+            logger.warning("Google API key not found or not configured")
+            return None
+        
+        import google.generativeai as genai
+        genai.configure(api_key=google_api_key)
+        model = genai.GenerativeModel('gemini-pro')
+        logger.info("Gemini client initialized")
+        return model
     
     def generate_irrigation_insight(
         self,
@@ -275,15 +349,11 @@ class LLMService:
     
     def _generate_with_openai(self, context: str, insight_type: str) -> Dict[str, Any]:
         """Generate insight using OpenAI"""
-        prompt = self._get_prompt_template(insight_type)
-        full_prompt = f"{prompt}\n\n{context}"
+        prefix = _PREFIX_MESSAGES.get(insight_type, _PREFIX_MESSAGES["irrigation"])
         
         response = self.openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert agricultural consultant providing insights based on farm sensor data and ML predictions."},
-                {"role": "user", "content": full_prompt}
-            ],
+            messages=[*prefix, {"role": "user", "content": context}],
             max_tokens=500,
             temperature=0.7
         )
@@ -304,40 +374,7 @@ class LLMService:
     
     def _get_prompt_template(self, insight_type: str) -> str:
         """Get prompt template for different insight types"""
-        templates = {
-            "irrigation": """
-            Based on the farm sensor data and ML prediction, provide irrigation recommendations.
-            Include:
-            1. Whether irrigation is needed and why
-            2. Specific recommendations for irrigation timing and amount
-            3. Any warnings about over/under irrigation
-            4. Weather considerations
-            
-            Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
-            """,
-            "crop_health": """
-            Based on the farm sensor data and ML prediction, provide crop health insights.
-            Include:
-            1. Assessment of current crop health
-            2. Factors affecting crop health
-            3. Recommendations for improvement
-            4. Potential issues to watch for
-            
-            Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
-            """,
-            "yield": """
-            Based on the farm sensor data and ML prediction, provide yield insights.
-            Include:
-            1. Yield prediction analysis
-            2. Factors influencing yield
-            3. Recommendations to optimize yield
-            4. Risk factors affecting yield
-            
-            Format your response as JSON with keys: insight_type, content, recommendations, warnings, confidence
-            """
-        }
-        
-        return templates.get(insight_type, templates["irrigation"])
+        return _PROMPT_TEMPLATES.get(insight_type, _PROMPT_TEMPLATES["irrigation"])
     
     def _parse_llm_response(self, content: str, insight_type: str) -> Dict[str, Any]:
         """Parse LLM response into structured format"""
@@ -354,7 +391,7 @@ class LLMService:
             else:
                 raise ValueError("No JSON found in response")
             
-            parsed = json.loads(json_str)
+            parsed = _json_loads(json_str)
 
             # Normalize into a friendly structure expected by LLMInsight
             # Ensure we always have a human-readable content string
@@ -388,8 +425,19 @@ class LLMService:
                 else:
                     parsed[key] = [str(value)] if value else []
 
-            parsed['timestamp'] = datetime.utcnow().isoformat()
-            return parsed
+            try:
+                confidence = float(parsed.get("confidence", 0.6))
+            except (TypeError, ValueError):
+                confidence = 0.6
+
+            return {
+                "insight_type": str(parsed.get("insight_type") or insight_type),
+                "content": parsed["content"],
+                "recommendations": parsed["recommendations"],
+                "warnings": parsed["warnings"],
+                "confidence": confidence,
+                "timestamp": _tc.now_iso(),
+            }
             
         except Exception as e:
             logger.warning(f"Failed to parse LLM response as JSON: {e}")
@@ -397,6 +445,7 @@ class LLMService:
     
     def _generate_fallback_insight(self, context: Any, insight_type: str) -> Dict[str, Any]:
         """Generate fallback insight when LLM is not available"""
+        now_iso = _tc.now_iso()
         fallback_insights = {
             "irrigation": {
                 "insight_type": "irrigation_recommendation",
@@ -408,7 +457,7 @@ class LLMService:
                 ],
                 "warnings": ["LLM service unavailable - using fallback recommendations"],
                 "confidence": 0.6,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             },
             "crop_health": {
                 "insight_type": "crop_health_assessment",
@@ -420,7 +469,7 @@ class LLMService:
                 ],
                 "warnings": ["LLM service unavailable - using fallback assessment"],
                 "confidence": 0.6,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             },
             "yield": {
                 "insight_type": "yield_prediction",
@@ -432,7 +481,7 @@ class LLMService:
                 ],
                 "warnings": ["LLM service unavailable - using fallback prediction"],
                 "confidence": 0.6,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             }
         }
         
@@ -1,17 +1,174 @@
 import os
-import requests
+import json
+import asyncio
+import atexit
+import operator
+import random
+import threading
+import time
+import httpx
+import numpy as np
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from app.utils.helpers import _iso_now
+
+# Optional fast JSON decoding
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Load environment variables
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging (handlers are configured in app.main)
 logger = logging.getLogger(__name__)
 
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result.
+
+    A dedicated loop thread is used instead of asyncio.run() so the sync service
+    methods can also be called from inside FastAPI's running event loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='third-party-io', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Process-wide HTTP/2 client for every OpenWeather call, used on the background loop.
+
+    Concurrent requests to the same host are multiplexed over pooled connections.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2)
+        )
+    return _client
+
+
+@atexit.register
+def close_clients():
+    """Release the shared HTTP client before its loop thread is torn down"""
+    if _loop is not None and _client is not None and not _client.is_closed:
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result(timeout=5)
+
+
+class _ResponseCache:
+    """Keyed cache of (fetched_at, payload, refreshing) entries with a fixed TTL.
+
+    Expired entries are kept until evicted by size so they can still be
+    served as a stale fallback when the upstream request fails. With a
+    non-zero stale_window, entries up to ttl + stale_window old are served
+    immediately while a single background refresh is triggered
+    (stale-while-revalidate).
+    """
+    
+    def __init__(self, ttl: float, stale_window: float = 0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.stale_window = stale_window
+        self.maxsize = maxsize
+        self._entries: Dict[Tuple[float, float], Tuple[float, Any, bool]] = {}
+        self._lock = threading.Lock()
+    
+    def lookup(self, key: Tuple[float, float]) -> Tuple[Optional[Any], bool]:
+        """Return (payload, needs_refresh) for fresh or revalidatable entries.
+
+        needs_refresh is True for exactly one caller per stale entry; that
+        caller is responsible for refreshing it in the background.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            fetched_at, payload, refreshing = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                return payload, False
+            if age < self.ttl + self.stale_window:
+                if refreshing:
+                    return payload, False
+                self._entries[key] = (fetched_at, payload, True)
+                return payload, True
+            return None, False
+    
+    def get_stale(self, key: Tuple[float, float]) -> Optional[Any]:
+        """Return the payload regardless of age"""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+    
+    def set(self, key: Tuple[float, float], payload: Any):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), payload, False)
+            if len(self._entries) > self.maxsize:
+                # Drop the least recently written entry
+                del self._entries[next(iter(self._entries))]
+    
+    def refresh_failed(self, key: Tuple[float, float]):
+        """Clear the refreshing flag so a later lookup can retry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], False)
+
+
+# Air quality index mapping
+_AQI_LEVELS = {
+    1: "Good",
+    2: "Fair", 
+    3: "Moderate",
+    4: "Poor",
+    5: "Very Poor"
+}
+
+# Field extractors for OpenWeather forecast items
+_MAIN_GET = operator.itemgetter('temp', 'humidity', 'pressure', 'temp_min', 'temp_max')
+_CONDITIONS_GET = operator.itemgetter('description', 'icon')
+
+# Mock forecast conditions
+_DESCRIPTIONS = ('clear sky', 'few clouds', 'scattered clouds', 'broken clouds', 'shower rain')
+_ICONS = ('01d', '02d', '03d', '04d', '09d')
+
+_rng = np.random.default_rng()
+
+# Mock forecast / historical spacing
+_STEP = timedelta(hours=3)
+_DAY = timedelta(days=1)
+
+# Raw OpenWeather payloads, shared by all service instances. Current
+# conditions and air quality are served stale-while-revalidate.
+_weather_cache = _ResponseCache(ttl=600, stale_window=600)
+_forecast_cache = _ResponseCache(ttl=3600)
+_air_quality_cache = _ResponseCache(ttl=900, stale_window=900)
+_uv_cache = _ResponseCache(ttl=1800, stale_window=1800)
+
+# Background refreshes for stale entries, kept referenced until done
+_refresh_tasks = set()
+
+# Upstream fetches in flight per (url, cache key); concurrent misses await the
+# same task instead of each hitting OpenWeather. Only touched on the loop thread.
+_inflight: Dict[Tuple[str, Tuple[float, float]], "asyncio.Future"] = {}
+
+
+def _cache_key(lat: float, lon: float) -> Tuple[float, float]:
+    return (round(lat, 3), round(lon, 3))
+
 
 class ThirdPartyService:
     """Service for integrating with third-party APIs"""
@@ -21,120 +178,244 @@ class ThirdPartyService:
         self.openweather_base_url = os.getenv('WEATHER_API_URL', 'https://api.openweathermap.org/data/2.5')
         self.default_lat = float(os.getenv('DEFAULT_LATITUDE', '40.7128'))
         self.default_lon = float(os.getenv('DEFAULT_LONGITUDE', '-74.0060'))
+        self._api_configured = (
+            bool(self.openweather_api_key)
+            and self.openweather_api_key != 'your_openweather_api_key_here'
+        )
+        if not self._api_configured:
+            logger.warning("OpenWeather API key not configured, weather endpoints will return mock data")
+        
+        # Endpoint URLs and static query params, built once
+        self._url_weather = f"{self.openweather_base_url}/weather"
+        self._url_forecast = f"{self.openweather_base_url}/forecast"
+        self._url_uvi = f"{self.openweather_base_url}/uvi"
+        self._url_air_pollution = f"{self.openweather_base_url}/air_pollution"
+        self._base_params = {'appid': self.openweather_api_key}
+        self._base_params_metric = {'appid': self.openweather_api_key, 'units': 'metric'}
     
     def get_weather_data(self, latitude: Optional[float] = None, 
                         longitude: Optional[float] = None) -> Dict[str, Any]:
         """Get current weather data from OpenWeatherMap API"""
-        if not self.openweather_api_key or self.openweather_api_key == 'your_openweather_api_key_here':
-            logger.warning("OpenWeather API key not configured, returning mock data")
+        if not self._api_configured:
             return self._get_mock_weather_data()
         
         lat = latitude or self.default_lat
         lon = longitude or self.default_lon
         
         try:
-            # Get current weather
-            current_url = f"{self.openweather_base_url}/weather"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.openweather_api_key,
-                'units': 'metric'
-            }
-            
-            response = requests.get(current_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Get UV index (requires separate API call)
-            uv_index = self._get_uv_index(lat, lon)
-            
-            weather_data = {
-                'temperature': data['main']['temp'],
-                'humidity': data['main']['humidity'],
-                'precipitation': data.get('rain', {}).get('1h', 0),
-                'wind_speed': data['wind']['speed'],
-                'wind_direction': data['wind'].get('deg', 0),
-                'pressure': data['main']['pressure'],
-                'visibility': data.get('visibility', 0) / 1000,  # Convert to km
-                'uv_index': uv_index,
-                'timestamp': datetime.utcnow().isoformat(),
-                'location': data['name'],
-                'country': data['sys']['country'],
-                'weather_description': data['weather'][0]['description'],
-                'weather_icon': data['weather'][0]['icon']
-            }
-            
-            logger.info(f"Weather data fetched for {data['name']}, {data['sys']['country']}")
+            # Current weather and UV index are fetched concurrently
+            weather_data, _ = _run_async(self._aget_weather_bundle(lat, lon))
             return weather_data
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching weather data: {e}")
-            return self._get_mock_weather_data()
         except Exception as e:
-            logger.error(f"Unexpected error fetching weather data: {e}")
+            logger.error("Unexpected error fetching weather data: %s", e)
             return self._get_mock_weather_data()
     
+    def get_weather_bundle(self, latitude: Optional[float] = None, 
+                           longitude: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get current weather and air quality with all upstream requests in flight at once"""
+        if not self._api_configured:
+            return self._get_mock_batch(1)[0]
+        
+        lat = latitude or self.default_lat
+        lon = longitude or self.default_lon
+        
+        try:
+            return _run_async(self._aget_weather_bundle(lat, lon, include_air_quality=True))
+        except Exception as e:
+            logger.error("Unexpected error fetching weather bundle: %s", e)
+            return self._get_mock_batch(1)[0]
+    
+    def get_weather_data_batch(self, coords: List[Tuple[float, float]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Get weather and air quality for many locations concurrently.
+
+        Returns one (weather_data, air_quality) pair per input coordinate, in order.
+        """
+        if not self._api_configured:
+            return self._get_mock_batch(len(coords))
+        
+        try:
+            return _run_async(self._aget_weather_batch(coords))
+        except Exception as e:
+            logger.error("Unexpected error fetching weather batch: %s", e)
+            return self._get_mock_batch(len(coords))
+    
+    def _get_mock_batch(self, n: int) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Generate n mock (weather, air quality) pairs sharing one timestamp"""
+        now_iso = _iso_now()
+        return [(self._get_mock_weather_data(now_iso), self._get_mock_air_quality_data(now_iso))
+                for _ in range(n)]
+    
+    async def _aget_weather_batch(self, coords: List[Tuple[float, float]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Fetch weather bundles for all coordinates over the shared client"""
+        bundles = await asyncio.gather(*[
+            self._aget_weather_bundle(lat, lon, include_air_quality=True) for lat, lon in coords
+        ])
+        return list(bundles)
+    
+    async def _aget_weather_bundle(self, lat: float, lon: float, 
+                                   include_air_quality: bool = False) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Fetch /weather, /uvi and optionally /air_pollution concurrently"""
+        params = {**self._base_params, 'lat': lat, 'lon': lon}
+        key = _cache_key(lat, lon)
+        
+        coros = [
+            self._afetch_cached(_weather_cache, key, self._url_weather,
+                                {**self._base_params_metric, 'lat': lat, 'lon': lon}, 10),
+            self._afetch_cached(_uv_cache, key, self._url_uvi, params, 5),
+        ]
+        if include_air_quality:
+            coros.append(self._afetch_cached(_air_quality_cache, key,
+                                             self._url_air_pollution, params, 10))
+        
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        current, uv = results[0], results[1]
+        # One timestamp for every record in the bundle
+        now_iso = _iso_now()
+        
+        if isinstance(uv, Exception):
+            logger.warning("Could not fetch UV index: %s", uv)
+            uv_index = 0
+        else:
+            uv_index = uv.get('value', 0)
+        
+        if isinstance(current, Exception):
+            logger.error("Error fetching weather data: %s", current)
+            weather_data = self._get_mock_weather_data(now_iso)
+        else:
+            weather_data = self._parse_weather_data(current, uv_index, now_iso)
+            logger.info("Weather data fetched for %s, %s", current['name'], current['sys']['country'])
+        
+        air_quality = None
+        if include_air_quality:
+            if isinstance(results[2], Exception):
+                logger.error("Error fetching air quality data: %s", results[2])
+                air_quality = self._get_mock_air_quality_data(now_iso)
+            else:
+                air_quality = self._parse_air_quality(results[2], now_iso)
+        
+        return weather_data, air_quality
+    
+    async def _afetch_cached(self, cache: _ResponseCache, key: Tuple[float, float], url: str,
+                             params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Async cached GET; serves a stale entry if the request fails"""
+        data, needs_refresh = cache.lookup(key)
+        if needs_refresh:
+            task = asyncio.ensure_future(self._arefresh(cache, key, url, params, timeout))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        if data is not None:
+            return data
+        flight_key = (url, key)
+        fetch = _inflight.get(flight_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._afetch_json(url, params, timeout))
+            _inflight[flight_key] = fetch
+            fetch.add_done_callback(lambda _: _inflight.pop(flight_key, None))
+        try:
+            # Shielded so one cancelled waiter does not cancel the shared fetch
+            data = await asyncio.shield(fetch)
+        except Exception as e:
+            data = cache.get_stale(key)
+            if data is None:
+                raise
+            logger.warning("Serving stale cached response for %s: %s", url, e)
+            return data
+        cache.set(key, data)
+        return data
+    
+    async def _arefresh(self, cache: _ResponseCache, key: Tuple[float, float], url: str,
+                        params: Dict[str, Any], timeout: float):
+        """Revalidate a stale entry on the background loop"""
+        try:
+            cache.set(key, await self._afetch_json(url, params, timeout))
+        except Exception as e:
+            cache.refresh_failed(key)
+            logger.warning("Background refresh failed for %s: %s", url, e)
+    
+    def _fetch_cached(self, cache: _ResponseCache, key: Tuple[float, float], url: str,
+                      params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Cached GET for the sync methods, run on the shared loop and client"""
+        return _run_async(self._afetch_cached(cache, key, url, params, timeout))
+    
+    @staticmethod
+    async def _afetch_json(url: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """GET a JSON document with the shared httpx client"""
+        response = await _get_client().get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    def _parse_weather_data(self, data: Dict[str, Any], uv_index: float,
+                            now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """Convert an OpenWeather /weather payload into our weather dict"""
+        if now_iso is None:
+            now_iso = _iso_now()
+        return {
+            'temperature': data['main']['temp'],
+            'humidity': data['main']['humidity'],
+            'precipitation': data.get('rain', {}).get('1h', 0),
+            'wind_speed': data['wind']['speed'],
+            'wind_direction': data['wind'].get('deg', 0),
+            'pressure': data['main']['pressure'],
+            'visibility': data.get('visibility', 0) / 1000,  # Convert to km
+            'uv_index': uv_index,
+            'timestamp': now_iso,
+            'location': data['name'],
+            'country': data['sys']['country'],
+            'weather_description': data['weather'][0]['description'],
+            'weather_icon': data['weather'][0]['icon']
+        }
+    
     def get_weather_forecast(self, latitude: Optional[float] = None, 
                            longitude: Optional[float] = None, 
                            days: int = 5) -> List[Dict[str, Any]]:
         """Get weather forecast from OpenWeatherMap API"""
-        if not self.openweather_api_key or self.openweather_api_key == 'your_openweather_api_key_here':
-            logger.warning("OpenWeather API key not configured, returning mock forecast")
+        if not self._api_configured:
             return self._get_mock_forecast_data(days)
         
         lat = latitude or self.default_lat
         lon = longitude or self.default_lon
         
         try:
-            url = f"{self.openweather_base_url}/forecast"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.openweather_api_key,
-                'units': 'metric'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            params = {**self._base_params_metric, 'lat': lat, 'lon': lon}
+            data = self._fetch_cached(_forecast_cache, _cache_key(lat, lon), self._url_forecast, params, 10)
+            # Process forecast data (3-hour intervals, 8 forecasts per day);
+            # nested fields are pulled out with precompiled itemgetters
             forecasts = []
-            
-            # Process forecast data (3-hour intervals)
-            for item in data['list'][:days * 8]:  # 8 forecasts per day
-                forecast = {
-                    'temperature': item['main']['temp'],
-                    'humidity': item['main']['humidity'],
-                    'precipitation': item.get('rain', {}).get('3h', 0),
-                    'wind_speed': item['wind']['speed'],
-                    'wind_direction': item['wind'].get('deg', 0),
-                    'pressure': item['main']['pressure'],
+            append = forecasts.append
+            for item in data['list'][:days * 8]:
+                temp, humidity, pressure, temp_min, temp_max = _MAIN_GET(item['main'])
+                description, icon = _CONDITIONS_GET(item['weather'][0])
+                wind = item['wind']
+                rain = item.get('rain')
+                append({
+                    'temperature': temp,
+                    'humidity': humidity,
+                    'precipitation': rain.get('3h', 0) if rain else 0,
+                    'wind_speed': wind['speed'],
+                    'wind_direction': wind.get('deg', 0),
+                    'pressure': pressure,
                     'timestamp': item['dt_txt'],
-                    'description': item['weather'][0]['description'],
-                    'icon': item['weather'][0]['icon'],
-                    'temperature_min': item['main']['temp_min'],
-                    'temperature_max': item['main']['temp_max']
-                }
-                forecasts.append(forecast)
+                    'description': description,
+                    'icon': icon,
+                    'temperature_min': temp_min,
+                    'temperature_max': temp_max
+                })
             
-            logger.info(f"Weather forecast fetched for {days} days")
+            logger.info("Weather forecast fetched for %s days", days)
             return forecasts
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching weather forecast: {e}")
+        except httpx.HTTPError as e:
+            logger.error("Error fetching weather forecast: %s", e)
             return self._get_mock_forecast_data(days)
         except Exception as e:
-            logger.error(f"Unexpected error fetching weather forecast: {e}")
+            logger.error("Unexpected error fetching weather forecast: %s", e)
             return self._get_mock_forecast_data(days)
     
     def get_historical_weather(self, latitude: Optional[float] = None, 
                              longitude: Optional[float] = None, 
                              days_back: int = 7) -> List[Dict[str, Any]]:
         """Get historical weather data (requires One Call API 3.0)"""
-        if not self.openweather_api_key or self.openweather_api_key == 'your_openweather_api_key_here':
-            logger.warning("OpenWeather API key not configured, returning mock historical data")
+        if not self._api_configured:
             return self._get_mock_historical_data(days_back)
         
         lat = latitude or self.default_lat
@@ -147,33 +428,13 @@ class ThirdPartyService:
             return self._get_mock_historical_data(days_back)
             
         except Exception as e:
-            logger.error(f"Error fetching historical weather data: {e}")
+            logger.error("Error fetching historical weather data: %s", e)
             return self._get_mock_historical_data(days_back)
     
-    def _get_uv_index(self, latitude: float, longitude: float) -> float:
-        """Get UV index data (requires separate API call)"""
-        try:
-            url = f"{self.openweather_base_url}/uvi"
-            params = {
-                'lat': latitude,
-                'lon': longitude,
-                'appid': self.openweather_api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data.get('value', 0)
-            
-        except Exception as e:
-            logger.warning(f"Could not fetch UV index: {e}")
-            return 0
-    
-    def _get_mock_weather_data(self) -> Dict[str, Any]:
+    def _get_mock_weather_data(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Generate mock weather data for testing"""
-        import random
-        
+        if now_iso is None:
+            now_iso = _iso_now()
         return {
             'temperature': round(random.uniform(15, 30), 1),
             'humidity': round(random.uniform(40, 80), 1),
@@ -183,7 +444,7 @@ class ThirdPartyService:
             'pressure': round(random.uniform(1000, 1020), 1),
             'visibility': round(random.uniform(5, 15), 1),
             'uv_index': round(random.uniform(0, 10), 1),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now_iso,
             'location': 'Mock Location',
             'country': 'US',
             'weather_description': 'clear sky',
@@ -192,122 +453,121 @@ class ThirdPartyService:
     
     def _get_mock_forecast_data(self, days: int) -> List[Dict[str, Any]]:
         """Generate mock forecast data for testing"""
-        import random
-        
-        forecasts = []
+        n = days * 8  # 8 forecasts per day (3-hour intervals)
         base_time = datetime.utcnow()
         
-        for i in range(days * 8):  # 8 forecasts per day (3-hour intervals)
-            forecast_time = base_time + timedelta(hours=i * 3)
-            temp = round(random.uniform(15, 30), 1)
-            
-            forecasts.append({
-                'temperature': temp,
-                'humidity': round(random.uniform(40, 80), 1),
-                'precipitation': round(random.uniform(0, 5), 1),
-                'wind_speed': round(random.uniform(1, 10), 1),
-                'wind_direction': round(random.uniform(0, 360), 1),
-                'pressure': round(random.uniform(1000, 1020), 1),
-                'timestamp': forecast_time.isoformat(),
-                'description': random.choice(['clear sky', 'few clouds', 'scattered clouds', 'broken clouds', 'shower rain']),
-                'icon': random.choice(['01d', '02d', '03d', '04d', '09d']),
-                'temperature_min': round(temp - random.uniform(2, 5), 1),
-                'temperature_max': round(temp + random.uniform(2, 5), 1)
-            })
+        temps = _rng.uniform(15, 30, n).round(1)
+        temp_min = (temps - _rng.uniform(2, 5, n)).round(1)
+        temp_max = (temps + _rng.uniform(2, 5, n)).round(1)
+        humidity = _rng.uniform(40, 80, n).round(1)
+        precipitation = _rng.uniform(0, 5, n).round(1)
+        wind_speed = _rng.uniform(1, 10, n).round(1)
+        wind_direction = _rng.uniform(0, 360, n).round(1)
+        pressure = _rng.uniform(1000, 1020, n).round(1)
+        descriptions = _rng.integers(0, len(_DESCRIPTIONS), n)
+        icons = _rng.integers(0, len(_ICONS), n)
+        timestamps = [(base_time + i * _STEP).isoformat() for i in range(n)]
         
-        return forecasts
+        return [
+            {
+                'temperature': temp,
+                'humidity': hum,
+                'precipitation': precip,
+                'wind_speed': wind,
+                'wind_direction': wind_dir,
+                'pressure': press,
+                'timestamp': ts,
+                'description': _DESCRIPTIONS[desc],
+                'icon': _ICONS[icon],
+                'temperature_min': t_min,
+                'temperature_max': t_max
+            }
+            for ts, temp, hum, precip, wind, wind_dir, press, desc, icon, t_min, t_max in zip(
+                timestamps, temps.tolist(), humidity.tolist(), precipitation.tolist(), wind_speed.tolist(),
+                wind_direction.tolist(), pressure.tolist(), descriptions.tolist(), icons.tolist(),
+                temp_min.tolist(), temp_max.tolist()
+            )
+        ]
     
     def _get_mock_historical_data(self, days_back: int) -> List[Dict[str, Any]]:
         """Generate mock historical weather data"""
-        import random
-        
-        historical_data = []
         base_time = datetime.utcnow() - timedelta(days=days_back)
         
-        for i in range(days_back):
-            day_time = base_time + timedelta(days=i)
-            
-            historical_data.append({
-                'date': day_time.strftime('%Y-%m-%d'),
-                'temperature_avg': round(random.uniform(15, 30), 1),
-                'temperature_min': round(random.uniform(10, 20), 1),
-                'temperature_max': round(random.uniform(25, 35), 1),
-                'humidity': round(random.uniform(40, 80), 1),
-                'precipitation': round(random.uniform(0, 10), 1),
-                'wind_speed': round(random.uniform(1, 10), 1),
-                'pressure': round(random.uniform(1000, 1020), 1)
-            })
+        dates = [(base_time + i * _DAY).strftime('%Y-%m-%d') for i in range(days_back)]
+        columns = zip(
+            dates,
+            _rng.uniform(15, 30, days_back).round(1).tolist(),
+            _rng.uniform(10, 20, days_back).round(1).tolist(),
+            _rng.uniform(25, 35, days_back).round(1).tolist(),
+            _rng.uniform(40, 80, days_back).round(1).tolist(),
+            _rng.uniform(0, 10, days_back).round(1).tolist(),
+            _rng.uniform(1, 10, days_back).round(1).tolist(),
+            _rng.uniform(1000, 1020, days_back).round(1).tolist()
+        )
         
-        return historical_data
+        return [
+            {
+                'date': date,
+                'temperature_avg': t_avg,
+                'temperature_min': t_min,
+                'temperature_max': t_max,
+                'humidity': hum,
+                'precipitation': precip,
+                'wind_speed': wind,
+                'pressure': press
+            }
+            for date, t_avg, t_min, t_max, hum, precip, wind, press in columns
+        ]
     
     def get_air_quality(self, latitude: Optional[float] = None, 
                        longitude: Optional[float] = None) -> Dict[str, Any]:
         """Get air quality data (requires Air Pollution API)"""
-        if not self.openweather_api_key or self.openweather_api_key == 'your_openweather_api_key_here':
-            logger.warning("OpenWeather API key not configured, returning mock air quality data")
+        if not self._api_configured:
             return self._get_mock_air_quality_data()
         
         lat = latitude or self.default_lat
         lon = longitude or self.default_lon
         
         try:
-            url = f"{self.openweather_base_url}/air_pollution"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.openweather_api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            params = {**self._base_params, 'lat': lat, 'lon': lon}
+            data = self._fetch_cached(_air_quality_cache, _cache_key(lat, lon), self._url_air_pollution, params, 10)
             
-            # Air quality index mapping
-            aqi_levels = {
-                1: "Good",
-                2: "Fair", 
-                3: "Moderate",
-                4: "Poor",
-                5: "Very Poor"
-            }
-            
-            air_quality = {
-                'aqi': data['list'][0]['main']['aqi'],
-                'aqi_level': aqi_levels.get(data['list'][0]['main']['aqi'], "Unknown"),
-                'co': data['list'][0]['components']['co'],
-                'no': data['list'][0]['components']['no'],
-                'no2': data['list'][0]['components']['no2'],
-                'o3': data['list'][0]['components']['o3'],
-                'pm2_5': data['list'][0]['components']['pm2_5'],
-                'pm10': data['list'][0]['components']['pm10'],
-                'so2': data['list'][0]['components']['so2'],
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
-            logger.info(f"Air quality data fetched - AQI: {air_quality['aqi']} ({air_quality['aqi_level']})")
-            return air_quality
+            return self._parse_air_quality(data)
             
         except Exception as e:
-            logger.error(f"Error fetching air quality data: {e}")
+            logger.error("Error fetching air quality data: %s", e)
             return self._get_mock_air_quality_data()
     
-    def _get_mock_air_quality_data(self) -> Dict[str, Any]:
-        """Generate mock air quality data"""
-        import random
+    def _parse_air_quality(self, data: Dict[str, Any], 
+                           now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """Convert an OpenWeather /air_pollution payload into our air quality dict"""
+        if now_iso is None:
+            now_iso = _iso_now()
+        air_quality = {
+            'aqi': data['list'][0]['main']['aqi'],
+            'aqi_level': _AQI_LEVELS.get(data['list'][0]['main']['aqi'], "Unknown"),
+            'co': data['list'][0]['components']['co'],
+            'no': data['list'][0]['components']['no'],
+            'no2': data['list'][0]['components']['no2'],
+            'o3': data['list'][0]['components']['o3'],
+            'pm2_5': data['list'][0]['components']['pm2_5'],
+            'pm10': data['list'][0]['components']['pm10'],
+            'so2': data['list'][0]['components']['so2'],
+            'timestamp': now_iso
+        }
         
+        logger.info("Air quality data fetched - AQI: %s (%s)", air_quality['aqi'], air_quality['aqi_level'])
+        return air_quality
+    
+    def _get_mock_air_quality_data(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """Generate mock air quality data"""
         aqi = random.randint(1, 5)
-        aqi_levels = {
-            1: "Good",
-            2: "Fair", 
-            3: "Moderate",
-            4: "Poor",
-            5: "Very Poor"
-        }
+        if now_iso is None:
+            now_iso = _iso_now()
         
         return {
             'aqi': aqi,
-            'aqi_level': aqi_levels[aqi],
+            'aqi_level': _AQI_LEVELS[aqi],
             'co': round(random.uniform(0, 1000), 1),
             'no': round(random.uniform(0, 50), 1),
             'no2': round(random.uniform(0, 100), 1),
@@ -315,7 +575,7 @@ class ThirdPartyService:
             'pm2_5': round(random.uniform(0, 50), 1),
             'pm10': round(random.uniform(0, 100), 1),
             'so2': round(random.uniform(0, 50), 1),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': now_iso
         }
 
 
@@ -1,15 +1,126 @@
 import os
-import joblib
-import random
-import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
+import json
+import heapq
+import time
+import importlib.util
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
+# numpy and joblib are imported where they are used so that callers needing
+# only validation or alerts do not pay their import cost
+if TYPE_CHECKING:
+    import numpy as np
+
+# Optional fast JSON encoding; datetimes still go through str() as with json.dump
+try:
+    import orjson
+    _ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                       orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=str).encode()
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Last (time, formatted timestamp) pair, refreshed at most once per second.
+# It is replaced in one assignment so other threads never see a mismatched pair.
+_ts_last = (0.0, "")
+
+
+def _iso_now() -> str:
+    """Current UTC time in ISO format, cached at one-second granularity"""
+    global _ts_last
+    last = _ts_last
+    t = time.time()
+    if t - last[0] >= 1.0:
+        last = (t, datetime.utcfromtimestamp(t).isoformat())
+        _ts_last = last
+    return last[1]
+
+
+def _rolling_stats_numpy(values: "np.ndarray", window_size: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Mean and variance of the window preceding each index, via prefix sums"""
+    import numpy as np
+    # Centre the series so the squared prefix sums stay small even on a large offset
+    shift = values.mean()
+    centred = values - shift
+    cs = np.concatenate(([0.0], np.cumsum(centred)))
+    cs2 = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    means = (cs[window_size:-1] - cs[:-window_size-1]) / window_size
+    variance = (cs2[window_size:-1] - cs2[:-window_size-1]) / window_size - means ** 2
+    # Differences of running sums carry absolute rounding error proportional to
+    # the sums themselves; anything within that error is zero spread
+    tolerance = 4 * np.finfo(np.float64).eps * cs2[window_size:-1]
+    variance = np.where(variance > tolerance, variance, 0.0)
+    return means + shift, variance
+
+
+def _rolling_stats_welford(values, window_size, means, variance):
+    """Sliding-window Welford update: O(N), no per-window re-summation"""
+    mean = 0.0
+    m2 = 0.0
+    # Length of the run of identical values ending at the newest sample
+    run = 1
+    for k in range(window_size):
+        delta = values[k] - mean
+        mean += delta / (k + 1)
+        m2 += delta * (values[k] - mean)
+        if k > 0:
+            run = run + 1 if values[k] == values[k - 1] else 1
+    
+    for i in range(window_size, values.shape[0]):
+        if run >= window_size:
+            # A constant window has exactly zero spread; drop the round-off
+            # remainder m2 carries over from earlier, noisier windows
+            mean = values[i - 1]
+            m2 = 0.0
+        means[i - window_size] = mean
+        variance[i - window_size] = max(m2 / window_size, 0.0)
+        # Replace the oldest sample with the current one
+        x_old = values[i - window_size]
+        x_new = values[i]
+        new_mean = mean + (x_new - x_old) / window_size
+        m2 += (x_new - x_old) * (x_new - new_mean + x_old - mean)
+        mean = new_mean
+        run = run + 1 if x_new == values[i - 1] else 1
+
+
+_welford_kernel = None
+
+
+def _rolling_stats(values: "np.ndarray", window_size: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Rolling mean/variance, JIT-compiled with numba on first use when available"""
+    global _welford_kernel
+    if not NUMBA_AVAILABLE:
+        return _rolling_stats_numpy(values, window_size)
+    
+    import numpy as np
+    if _welford_kernel is None:
+        from numba import njit
+        _welford_kernel = njit(cache=True)(_rolling_stats_welford)
+    means = np.empty(len(values) - window_size)
+    variance = np.empty(len(values) - window_size)
+    _welford_kernel(values, window_size, means, variance)
+    return means, variance
+
+# Validation table: sensor type -> (min, max, label, unit)
+_RANGES = {
+    'dht_temperature': (-40, 80, 'Temperature', '°C'),
+    'dht_humidity': (0, 100, 'Humidity', '%'),
+    'soil_moisture': (0, 100, 'Soil moisture', '%'),
+    'soil_temperature': (-20, 60, 'Soil temperature', '°C'),
+}
+_REQUIRED_FIELDS = ('sensor_id', 'sensor_type', 'value', 'timestamp')
+_REQUIRED = frozenset(_REQUIRED_FIELDS)
+
 
 class DataProcessor:
     """Utility class for data processing and validation"""
@@ -20,35 +131,21 @@ class DataProcessor:
         errors = []
         
         # Check required fields
-        required_fields = ['sensor_id', 'sensor_type', 'value', 'timestamp']
-        for field in required_fields:
-            if field not in data:
-                errors.append(f"Missing required field: {field}")
-        
-        if errors:
+        if not _REQUIRED <= data.keys():
+            errors.extend(f"Missing required field: {field}" for field in _REQUIRED_FIELDS if field not in data)
             return False, errors
         
-        # Validate sensor type
-        valid_types = ['dht_temperature', 'dht_humidity', 'soil_moisture', 'soil_temperature']
-        if data['sensor_type'] not in valid_types:
-            errors.append(f"Invalid sensor type: {data['sensor_type']}")
-        
-        # Validate value ranges
+        # Validate sensor type and value range
         sensor_type = data['sensor_type']
         value = data['value']
         
-        if sensor_type == 'dht_temperature':
-            if not -40 <= value <= 80:
-                errors.append(f"Temperature out of range: {value}°C")
-        elif sensor_type == 'dht_humidity':
-            if not 0 <= value <= 100:
-                errors.append(f"Humidity out of range: {value}%")
-        elif sensor_type == 'soil_moisture':
-            if not 0 <= value <= 100:
-                errors.append(f"Soil moisture out of range: {value}%")
-        elif sensor_type == 'soil_temperature':
-            if not -20 <= value <= 60:
-                errors.append(f"Soil temperature out of range: {value}°C")
+        value_range = _RANGES.get(sensor_type)
+        if value_range is None:
+            errors.append(f"Invalid sensor type: {sensor_type}")
+        else:
+            lo, hi, label, unit = value_range
+            if not lo <= value <= hi:
+                errors.append(f"{label} out of range: {value}{unit}")
         
         # Validate timestamp
         try:
@@ -72,52 +169,56 @@ class DataProcessor:
         if len(sensor_data) < window_size:
             return anomalies
         
-        # Group by sensor type
-        sensor_groups = {}
-        for data in sensor_data:
-            sensor_type = data['sensor_type']
-            if sensor_type not in sensor_groups:
-                sensor_groups[sensor_type] = []
-            sensor_groups[sensor_type].append(data)
+        import numpy as np
+        
+        # Parallel arrays; sensor types are coded in order of first appearance
+        n = len(sensor_data)
+        type_codes = {}
+        codes = np.fromiter((type_codes.setdefault(d['sensor_type'], len(type_codes)) for d in sensor_data),
+                            dtype=np.intp, count=n)
+        timestamps = np.array([d['timestamp'] for d in sensor_data])
+        all_values = np.fromiter((d['value'] for d in sensor_data), dtype=np.float64, count=n)
         
-        for sensor_type, data_list in sensor_groups.items():
-            if len(data_list) < window_size:
+        # One stable sort by (sensor type, timestamp), then split at type boundaries
+        order = np.lexsort((timestamps, codes))
+        sorted_codes = codes[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1, [n]))
+        type_names = list(type_codes)
+        
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if stop - start < window_size:
                 continue
             
-            # Sort by timestamp
-            data_list.sort(key=lambda x: x['timestamp'])
-            values = [d['value'] for d in data_list]
+            sensor_type = type_names[sorted_codes[start]]
+            group = order[start:stop]
+            values = all_values[group]
             
-            # Calculate rolling statistics (simplified without numpy)
-            for i in range(window_size, len(values)):
-                window_values = values[i-window_size:i]
-                current_value = values[i]
-                
-                # Calculate mean
-                mean_val = sum(window_values) / len(window_values)
-                
-                # Calculate standard deviation
-                variance = sum((x - mean_val) ** 2 for x in window_values) / len(window_values)
-                std_val = variance ** 0.5
-                
-                # Detect outliers (values beyond 2 standard deviations)
-                if std_val > 0 and abs(current_value - mean_val) > 2 * std_val:
-                    anomalies.append({
-                        'sensor_id': data_list[i]['sensor_id'],
-                        'sensor_type': sensor_type,
-                        'value': current_value,
-                        'expected_range': [mean_val - 2*std_val, mean_val + 2*std_val],
-                        'timestamp': data_list[i]['timestamp'],
-                        'anomaly_type': 'statistical_outlier'
-                    })
+            # Rolling mean/variance of the preceding window (numba kernel when available)
+            means, variance = _rolling_stats(values, window_size)
+            stds = np.sqrt(variance)
+            
+            # Detect outliers (values beyond 2 standard deviations)
+            mask = (stds > 0) & (np.abs(values[window_size:] - means) > 2 * stds)
+            for j in np.flatnonzero(mask):
+                data = sensor_data[group[j + window_size]]
+                mean_val = float(means[j])
+                std_val = float(stds[j])
+                anomalies.append({
+                    'sensor_id': data['sensor_id'],
+                    'sensor_type': sensor_type,
+                    'value': data['value'],
+                    'expected_range': [mean_val - 2*std_val, mean_val + 2*std_val],
+                    'timestamp': data['timestamp'],
+                    'anomaly_type': 'statistical_outlier'
+                })
         
         return anomalies
     
     @staticmethod
     def prepare_features_for_prediction(sensor_data: Dict[str, Any], 
-                                      weather_data: Optional[Dict[str, Any]] = None) -> List[List[float]]:
-        """Prepare features for ML model prediction"""
-        features = []
+                                      weather_data: Optional[Dict[str, Any]] = None) -> "np.ndarray":
+        """Prepare features for ML model prediction as a (1, 11) float32 array"""
+        import numpy as np
         
         # Extract base sensor values with sensible defaults
         sensor_values = {
@@ -163,26 +264,34 @@ class DataProcessor:
         if isinstance(timestamp, str):
             timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
         
-        hour = timestamp.hour
-        day_of_year = timestamp.timetuple().tm_yday
-        month = timestamp.month
+        tt = timestamp.timetuple()
         
-        # Combine all features
-        features = [
-            sensor_values['temperature'],
-            sensor_values['humidity'],
-            sensor_values['soil_moisture'],
-            sensor_values['soil_temperature'],
-            sensor_values['precipitation'],
-            sensor_values['wind_speed'],
-            temp_humidity_interaction,
-            moisture_temp_ratio,
-            hour,
-            day_of_year,
-            month
-        ]
+        # Combine all features into the dtype the models predict with
+        features = np.empty((1, 11), dtype=np.float32)
+        row = features[0]
+        row[0] = sensor_values['temperature']
+        row[1] = sensor_values['humidity']
+        row[2] = sensor_values['soil_moisture']
+        row[3] = sensor_values['soil_temperature']
+        row[4] = sensor_values['precipitation']
+        row[5] = sensor_values['wind_speed']
+        row[6] = temp_humidity_interaction
+        row[7] = moisture_temp_ratio
+        row[8] = tt.tm_hour
+        row[9] = tt.tm_yday
+        row[10] = tt.tm_mon
         
-        return [features]  # Return as list of lists for compatibility
+        return features
+
+
+# Artifacts written by app/models/train.py; all must exist for ModelManager
+# to build its scaler/model pipelines
+REQUIRED_MODEL_FILES = (
+    "irrigation_model.pkl", "irrigation_scaler.pkl",
+    "crop_health_model.pkl", "crop_health_scaler.pkl",
+    "yield_model.pkl", "yield_scaler.pkl",
+    "model_metadata.pkl",
+)
 
 
 class ModelManager:
@@ -193,16 +302,23 @@ class ModelManager:
         self.models = {}
         self.scalers = {}
         self.metadata = {}
+        self.pipelines = {}
+        self._irr_classes = None
         self._load_models()
     
     def _load_models(self):
         """Load pre-trained models and scalers"""
         try:
-            # Load model metadata
+            import joblib
+            
+            # Load model metadata; missing artifacts surface as FileNotFoundError
+            # from the open itself, so no separate existence check is needed
             metadata_path = os.path.join(self.models_dir, 'model_metadata.pkl')
-            if os.path.exists(metadata_path):
+            try:
                 self.metadata = joblib.load(metadata_path)
                 logger.info("Model metadata loaded successfully")
+            except FileNotFoundError:
+                pass
             
             # Load models and scalers
             model_files = {
@@ -217,28 +333,43 @@ class ModelManager:
                 'yield': 'yield_scaler.pkl'
             }
             
+            # Artifacts are saved uncompressed, so their arrays can be memory-mapped
+            # read-only and shared between worker processes via the page cache
             for model_name, filename in model_files.items():
                 model_path = os.path.join(self.models_dir, filename)
-                if os.path.exists(model_path):
-                    self.models[model_name] = joblib.load(model_path)
+                try:
+                    self.models[model_name] = joblib.load(model_path, mmap_mode='r')
                     logger.info(f"{model_name} model loaded successfully")
+                except FileNotFoundError:
+                    continue
             
             for scaler_name, filename in scaler_files.items():
                 scaler_path = os.path.join(self.models_dir, filename)
-                if os.path.exists(scaler_path):
-                    self.scalers[scaler_name] = joblib.load(scaler_path)
+                try:
+                    self.scalers[scaler_name] = joblib.load(scaler_path, mmap_mode='r')
                     logger.info(f"{scaler_name} scaler loaded successfully")
+                except FileNotFoundError:
+                    continue
+            
+            # Fuse each scaler/model pair so prediction is a single call
+            from sklearn.pipeline import Pipeline
+            for name, model in self.models.items():
+                if name in self.scalers:
+                    self.pipelines[name] = Pipeline([('scaler', self.scalers[name]), ('model', model)])
+            
+            if 'irrigation' in self.models:
+                self._irr_classes = self.models['irrigation'].classes_
             
         except Exception as e:
             logger.error(f"Error loading models: {e}")
     
     def predict_irrigation_need(self, features: List[List[float]]) -> Dict[str, Any]:
         """Predict irrigation need"""
-        if 'irrigation' not in self.models or 'irrigation' not in self.scalers:
+        if 'irrigation' not in self.pipelines:
             # Models might have been trained after this instance was created
             logger.warning("Irrigation model not loaded, attempting reload before using defaults")
             self._load_models()
-            if 'irrigation' not in self.models or 'irrigation' not in self.scalers:
+            if 'irrigation' not in self.pipelines:
                 logger.warning("Irrigation model still not available, returning default prediction")
                 return {
                     'predicted_value': 0,
@@ -248,20 +379,19 @@ class ModelManager:
                 }
         
         try:
-            # Scale features
-            features_scaled = self.scalers['irrigation'].transform(features)
+            import numpy as np
+            pipeline = self.pipelines['irrigation']
+            features_arr = np.asarray(features, dtype=np.float32)
             
-            # Make prediction
-            prediction_array = self.models['irrigation'].predict(features_scaled)
-            prediction = int(prediction_array[0]) if len(prediction_array) > 0 else 0
-            
-            # Get prediction probabilities
-            prediction_proba = self.models['irrigation'].predict_proba(features_scaled)
-            
-            # Calculate confidence as the maximum probability
-            if prediction_proba is not None and len(prediction_proba) > 0:
-                confidence = float(np.max(prediction_proba[0]))
+            # One forest evaluation: the prediction is the most probable class
+            prediction_proba = pipeline.predict_proba(features_arr)
+            if len(prediction_proba) > 0:
+                idx0 = int(prediction_proba[0].argmax())
+                prediction = int(self._irr_classes[idx0])
+                # Confidence is the maximum probability
+                confidence = float(prediction_proba[0, idx0])
             else:
+                prediction = 0
                 confidence = 0.5
             
             return {
@@ -282,10 +412,10 @@ class ModelManager:
     
     def predict_crop_health(self, features: List[List[float]]) -> Dict[str, Any]:
         """Predict crop health score"""
-        if 'crop_health' not in self.models or 'crop_health' not in self.scalers:
+        if 'crop_health' not in self.pipelines:
             logger.warning("Crop health model not loaded, attempting reload before using defaults")
             self._load_models()
-            if 'crop_health' not in self.models or 'crop_health' not in self.scalers:
+            if 'crop_health' not in self.pipelines:
                 logger.warning("Crop health model still not available, returning default prediction")
                 return {
                     'predicted_value': 50.0,
@@ -295,11 +425,10 @@ class ModelManager:
                 }
         
         try:
-            # Scale features
-            features_scaled = self.scalers['crop_health'].transform(features)
-            
-            # Make prediction
-            prediction = self.models['crop_health'].predict(features_scaled)[0]
+            # Scale and predict in one pipeline call
+            import numpy as np
+            features_arr = np.asarray(features, dtype=np.float32)
+            prediction = self.pipelines['crop_health'].predict(features_arr)[0]
             
             # Calculate confidence based on prediction variance (simplified)
             confidence = 0.8  # This could be improved with proper uncertainty quantification
@@ -322,10 +451,10 @@ class ModelManager:
     
     def predict_yield(self, features: List[List[float]]) -> Dict[str, Any]:
         """Predict crop yield"""
-        if 'yield' not in self.models or 'yield' not in self.scalers:
+        if 'yield' not in self.pipelines:
             logger.warning("Yield model not loaded, attempting reload before using defaults")
             self._load_models()
-            if 'yield' not in self.models or 'yield' not in self.scalers:
+            if 'yield' not in self.pipelines:
                 logger.warning("Yield model still not available, returning default prediction")
                 return {
                     'predicted_value': 2000.0,
@@ -335,11 +464,10 @@ class ModelManager:
                 }
         
         try:
-            # Scale features
-            features_scaled = self.scalers['yield'].transform(features)
-            
-            # Make prediction
-            prediction = self.models['yield'].predict(features_scaled)[0]
+            # Scale and predict in one pipeline call
+            import numpy as np
+            features_arr = np.asarray(features, dtype=np.float32)
+            prediction = self.pipelines['yield'].predict(features_arr)[0]
             
             # Calculate confidence based on prediction variance (simplified)
             confidence = 0.8  # This could be improved with proper uncertainty quantification
@@ -360,6 +488,65 @@ class ModelManager:
                 'features_used': []
             }
     
+    def _batch_pipeline(self, name: str):
+        """Return the pipeline for name, reloading models once if it is missing"""
+        if name not in self.pipelines:
+            self._load_models()
+        return self.pipelines.get(name)
+    
+    def _predict_batch(self, name: str, label: str, X: "np.ndarray",
+                       predict: Callable[[Any, "np.ndarray"], Any], default: Callable[[int], Any]) -> Any:
+        """Shared batch path: coerce X to 2-D rows, run predict(pipeline, X) and
+        fall back to default(n_rows) when the model is missing or fails"""
+        import numpy as np
+        try:
+            X = np.asarray(X, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid features for {label.lower()} batch prediction: {e}")
+            return default(len(X))
+        if X.size == 0:
+            return default(0)
+        # A single 1-D feature row is treated as a batch of one
+        X = np.atleast_2d(X)
+        
+        pipeline = self._batch_pipeline(name)
+        if pipeline is None:
+            logger.warning(f"{label} model not available, returning default batch predictions")
+            return default(len(X))
+        
+        try:
+            return predict(pipeline, X)
+        except Exception as e:
+            logger.error(f"Error making {label.lower()} batch prediction: {e}")
+            return default(len(X))
+    
+    def predict_irrigation_batch(self, X: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Predict irrigation need for many feature rows in one model call.
+
+        Returns (predictions, confidences), one entry per row.
+        """
+        import numpy as np
+        
+        def predict(pipeline, X):
+            proba = pipeline.predict_proba(X)
+            idx = proba.argmax(axis=1)
+            return self._irr_classes[idx], proba[np.arange(len(idx)), idx]
+        
+        return self._predict_batch('irrigation', 'Irrigation', X, predict,
+                                   lambda n: (np.zeros(n, dtype=int), np.full(n, 0.5)))
+    
+    def predict_crop_health_batch(self, X: "np.ndarray") -> "np.ndarray":
+        """Predict crop health scores for many feature rows in one model call"""
+        import numpy as np
+        return self._predict_batch('crop_health', 'Crop health', X,
+                                   lambda pipeline, X: pipeline.predict(X), lambda n: np.full(n, 50.0))
+    
+    def predict_yield_batch(self, X: "np.ndarray") -> "np.ndarray":
+        """Predict crop yield for many feature rows in one model call"""
+        import numpy as np
+        return self._predict_batch('yield', 'Yield', X,
+                                   lambda pipeline, X: pipeline.predict(X), lambda n: np.full(n, 2000.0))
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models"""
         return {
@@ -425,9 +612,8 @@ class DataStorage:
         filepath = os.path.join(self.data_dir, filename)
         
         try:
-            import json
-            with open(filepath, 'w') as f:
-                json.dump(sensor_data, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(_json_dumps(sensor_data))
             logger.info(f"Sensor data saved to {filepath}")
         except Exception as e:
             logger.error(f"Error saving sensor data: {e}")
@@ -449,7 +635,6 @@ class DataStorage:
         filepath = os.path.join(self.data_dir, filename)
         
         try:
-            import json
             with open(filepath, 'r') as f:
                 data = json.load(f)
             logger.info(f"Sensor data loaded from {filepath}")
@@ -483,28 +668,37 @@ class DataStorage:
         filepath = os.path.join(self.data_dir, filename)
         
         try:
-            import json
-            with open(filepath, 'w') as f:
-                json.dump(predictions, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(_json_dumps(predictions))
             logger.info(f"Prediction results saved to {filepath}")
         except Exception as e:
             logger.error(f"Error saving prediction results: {e}")
     
-    def get_data_files(self) -> List[str]:
-        """Get list of data files or Firestore document IDs"""
+    def get_data_files(self, limit: Optional[int] = None) -> List[str]:
+        """Get list of data files or Firestore document IDs
+
+        Args:
+            limit: If set, only the newest `limit` files or documents are returned
+        """
         if self.use_firestore and self.firestore_service:
             try:
                 # Get recent sensor data documents
-                recent_data = self.firestore_service.query_sensor_data(limit=100)
+                recent_data = self.firestore_service.query_sensor_data(
+                    limit=100 if limit is None else limit)
                 # Return document IDs
-                return [doc.get('id', '') for doc in recent_data]
+                return [doc['id'] for doc in recent_data if 'id' in doc]
             except Exception as e:
                 logger.error(f"Error listing data from Firestore: {e}")
                 return []
         else:
             try:
-                files = [f for f in os.listdir(self.data_dir) if f.endswith('.json')]
-                return sorted(files)
+                with os.scandir(self.data_dir) as it:
+                    entries = [e for e in it if e.name.endswith('.json') and e.is_file()]
+                if limit is not None:
+                    # Names mix sensor_data_* and predictions_* prefixes, so rank by
+                    # modification time; partial sort for the newest few
+                    entries = heapq.nlargest(limit, entries, key=lambda e: e.stat().st_mtime)
+                return sorted(e.name for e in entries)
             except Exception as e:
                 logger.error(f"Error listing data files: {e}")
                 return []
@@ -520,43 +714,105 @@ class AlertManager:
             'soil_moisture': {'min': 20, 'max': 80},
             'soil_temperature': {'min': 5, 'max': 30}
         }
+        self._rebuild_limits()
+    
+    def _rebuild_limits(self):
+        """Flatten thresholds into a (name, min, max) tuple for the alert checks"""
+        self._limits = tuple(
+            (sensor_type, t['min'], t['max']) for sensor_type, t in self.alert_thresholds.items()
+        )
+    
+    @staticmethod
+    def _low_alert(sensor_type: str, value: float, threshold: float, timestamp: str) -> Dict[str, Any]:
+        return {
+            'type': 'low_threshold',
+            'sensor_type': sensor_type,
+            'value': value,
+            'threshold': threshold,
+            'message': f"{sensor_type} is below minimum threshold",
+            'severity': 'warning',
+            'timestamp': timestamp
+        }
+    
+    @staticmethod
+    def _high_alert(sensor_type: str, value: float, threshold: float, timestamp: str) -> Dict[str, Any]:
+        return {
+            'type': 'high_threshold',
+            'sensor_type': sensor_type,
+            'value': value,
+            'threshold': threshold,
+            'message': f"{sensor_type} is above maximum threshold",
+            'severity': 'critical',
+            'timestamp': timestamp
+        }
     
     def check_alerts(self, sensor_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Check for alert conditions in sensor data"""
         alerts = []
         
-        for sensor_type, thresholds in self.alert_thresholds.items():
+        for sensor_type, lo, hi in self._limits:
             if sensor_type in sensor_data:
                 value = sensor_data[sensor_type]
                 
-                if value < thresholds['min']:
-                    alerts.append({
-                        'type': 'low_threshold',
-                        'sensor_type': sensor_type,
-                        'value': value,
-                        'threshold': thresholds['min'],
-                        'message': f"{sensor_type} is below minimum threshold",
-                        'severity': 'warning',
-                        'timestamp': datetime.utcnow().isoformat()
-                    })
+                if value < lo:
+                    alerts.append(self._low_alert(sensor_type, value, lo, _iso_now()))
                 
-                if value > thresholds['max']:
-                    alerts.append({
-                        'type': 'high_threshold',
-                        'sensor_type': sensor_type,
-                        'value': value,
-                        'threshold': thresholds['max'],
-                        'message': f"{sensor_type} is above maximum threshold",
-                        'severity': 'critical',
-                        'timestamp': datetime.utcnow().isoformat()
-                    })
+                if value > hi:
+                    alerts.append(self._high_alert(sensor_type, value, hi, _iso_now()))
         
         return alerts
     
+    def check_alerts_batch(self, frame: "np.ndarray", 
+                           columns: Optional[List[str]] = None) -> List[List[Dict[str, Any]]]:
+        """Check alert conditions for many readings at once.
+
+        frame is an (N, len(columns)) array of sensor values; columns defaults to
+        all thresholded sensor types. Returns one alert list per row.
+
+        Raises:
+            ValueError: If columns is empty or names a sensor type without thresholds
+        """
+        import numpy as np
+        
+        limits = {name: (lo, hi) for name, lo, hi in self._limits}
+        columns = list(columns) if columns is not None else list(limits)
+        if not columns:
+            raise ValueError("columns must name at least one sensor type")
+        unknown = [name for name in columns if name not in limits]
+        if unknown:
+            raise ValueError(f"No alert thresholds for sensor types: {', '.join(unknown)}")
+        
+        frame = np.asarray(frame, dtype=float)
+        if frame.size == 0:
+            return []
+        frame = frame.reshape(-1, len(columns))
+        low = np.array([limits[name][0] for name in columns], dtype=float)
+        high = np.array([limits[name][1] for name in columns], dtype=float)
+        
+        low_mask = frame < low
+        high_mask = frame > high
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(frame.shape[0])]
+        rows, cols = np.nonzero(low_mask | high_mask)
+        if len(rows) == 0:
+            return results
+        
+        timestamp = _iso_now()
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            name = columns[c]
+            value = float(frame[r, c])
+            if low_mask[r, c]:
+                results[r].append(self._low_alert(name, value, self.alert_thresholds[name]['min'], timestamp))
+            else:
+                results[r].append(self._high_alert(name, value, self.alert_thresholds[name]['max'], timestamp))
+        
+        return results
+    
     def update_thresholds(self, sensor_type: str, min_val: float, max_val: float):
         """Update alert thresholds for a sensor type"""
         if sensor_type in self.alert_thresholds:
             self.alert_thresholds[sensor_type] = {'min': min_val, 'max': max_val}
+            self._rebuild_limits()
             logger.info(f"Updated thresholds for {sensor_type}: min={min_val}, max={max_val}")
         else:
             logger.warning(f"Unknown sensor type: {sensor_type}")
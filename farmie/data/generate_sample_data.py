@@ -1,11 +1,34 @@
 import json
-import random
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
 
+# Optional fast JSON encoding
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
+# Compact record for generated readings; converted with _asdict() for JSON output
+SensorReading = namedtuple(
+    "SensorReading", "sensor_id sensor_type value timestamp location metadata"
+)
+
+# Realistic value range per sensor type
+_RANGE_BY_TYPE = {
+    "dht_temperature": (15, 35),
+    "dht_humidity": (30, 80),
+    "soil_moisture": (20, 70),
+    "soil_temperature": (10, 30),
+}
+
 # Create sample sensor data for testing
 def generate_sample_sensor_data():
-    """Generate sample sensor data for testing the API"""
+    """Generate sample sensor readings (SensorReading tuples) for testing the API"""
     
     # Sample sensor configurations
     sensors = [
@@ -19,37 +42,35 @@ def generate_sample_sensor_data():
         {"id": "soil_temp_002", "type": "soil_temperature", "location": "field_b"},
     ]
     
-    # Generate sample data for each sensor
-    sample_data = []
+    # (low, high) value range for each sensor column
+    ranges = np.array([_RANGE_BY_TYPE[sensor["type"]] for sensor in sensors], dtype=float)
+    
+    # Draw every reading up front: 48 readings (every 30 minutes for 24 hours) per sensor
+    n_readings = 48
+    shape = (n_readings, len(sensors))
+    rng = np.random.default_rng()
+    values = rng.uniform(ranges[:, 0], ranges[:, 1], size=shape).round(1).tolist()
+    battery = rng.uniform(80, 100, size=shape).round(1).tolist()
+    signal = rng.uniform(70, 100, size=shape).round(1).tolist()
+    
     base_time = datetime.utcnow() - timedelta(hours=24)
+    iso_ts = [(base_time + timedelta(minutes=i * 30)).isoformat() for i in range(n_readings)]
     
-    for i in range(48):  # 48 readings (every 30 minutes for 24 hours)
-        timestamp = base_time + timedelta(minutes=i * 30)
-        
-        for sensor in sensors:
-            # Generate realistic values based on sensor type
-            if sensor["type"] == "dht_temperature":
-                value = round(random.uniform(15, 35), 1)
-            elif sensor["type"] == "dht_humidity":
-                value = round(random.uniform(30, 80), 1)
-            elif sensor["type"] == "soil_moisture":
-                value = round(random.uniform(20, 70), 1)
-            elif sensor["type"] == "soil_temperature":
-                value = round(random.uniform(10, 30), 1)
-            
-            sensor_data = {
-                "sensor_id": sensor["id"],
-                "sensor_type": sensor["type"],
-                "value": value,
-                "timestamp": timestamp.isoformat(),
-                "location": sensor["location"],
-                "metadata": {
-                    "battery_level": round(random.uniform(80, 100), 1),
-                    "signal_strength": round(random.uniform(70, 100), 1)
-                }
+    sample_data = [
+        SensorReading(
+            sensor["id"],
+            sensor["type"],
+            values[i][k],
+            iso_ts[i],
+            sensor["location"],
+            {
+                "battery_level": battery[i][k],
+                "signal_strength": signal[i][k]
             }
-            
-            sample_data.append(sensor_data)
+        )
+        for i in range(n_readings)
+        for k, sensor in enumerate(sensors)
+    ]
     
     return sample_data
 
@@ -57,24 +78,24 @@ def generate_batch_sensor_data():
     """Generate batch sensor data for testing"""
     sensors_data = generate_sample_sensor_data()
     
-    # Group by timestamp for batch requests
-    batch_data = []
-    timestamps = sorted(set(data["timestamp"] for data in sensors_data))
+    # Group by timestamp for batch requests in a single pass
+    groups = {}
+    for reading in sensors_data:
+        groups.setdefault(reading.timestamp, []).append(reading._asdict())
     
-    for timestamp in timestamps[:10]:  # First 10 timestamps
-        sensors_at_time = [data for data in sensors_data if data["timestamp"] == timestamp]
-        
-        batch_request = {
+    batch_data = [
+        {
             "farm_id": "farm_001",
-            "sensors": sensors_at_time
+            "sensors": groups[timestamp]
         }
-        
-        batch_data.append(batch_request)
+        for timestamp in sorted(groups)[:10]  # First 10 timestamps
+    ]
     
     return batch_data
 
 def generate_feedback_data():
     """Generate sample feedback data"""
+    now_iso = datetime.utcnow().isoformat()
     feedback_samples = [
         {
             "feedback_id": "feedback_001",
@@ -83,7 +104,7 @@ def generate_feedback_data():
             "user_rating": 4,
             "feedback_text": "Temperature prediction was accurate, helped optimize irrigation timing",
             "is_correct": True,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         },
         {
             "feedback_id": "feedback_002", 
@@ -92,7 +113,7 @@ def generate_feedback_data():
             "user_rating": 2,
             "feedback_text": "Soil moisture prediction was too low, caused over-irrigation",
             "is_correct": False,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         },
         {
             "feedback_id": "feedback_003",
@@ -101,31 +122,32 @@ def generate_feedback_data():
             "user_rating": 5,
             "feedback_text": "Excellent crop health assessment, recommendations were spot on",
             "is_correct": True,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         }
     ]
     
     return feedback_samples
 
+def _write_json(path, obj):
+    """Write obj to path as JSON"""
+    with open(path, "wb") as f:
+        f.write(_json_dumps(obj))
+
 def save_sample_data():
     """Save all sample data to files"""
     # Ensure data directory exists
     os.makedirs("data", exist_ok=True)
     
-    # Generate and save sensor data
-    sensor_data = generate_sample_sensor_data()
-    with open("data/sample_sensor_data.json", "w") as f:
-        json.dump(sensor_data, f, indent=2)
-    
-    # Generate and save batch data
-    batch_data = generate_batch_sensor_data()
-    with open("data/sample_batch_data.json", "w") as f:
-        json.dump(batch_data, f, indent=2)
+    # Generate all datasets first; they share no state
+    outputs = [
+        ("data/sample_sensor_data.json", [reading._asdict() for reading in generate_sample_sensor_data()]),
+        ("data/sample_batch_data.json", generate_batch_sensor_data()),
+        ("data/sample_feedback_data.json", generate_feedback_data()),
+    ]
     
-    # Generate and save feedback data
-    feedback_data = generate_feedback_data()
-    with open("data/sample_feedback_data.json", "w") as f:
-        json.dump(feedback_data, f, indent=2)
+    # Serialize and write the files concurrently
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        list(executor.map(lambda item: _write_json(*item), outputs))
     
     print("Sample data generated and saved to data/ directory:")
     print("- sample_sensor_data.json")
@@ -34,5 +34,7 @@ if __name__ == "__main__":
         host=host,
         port=port,
         reload=debug,
+        # Reload only works with a single process; WORKERS scales production serving
+        workers=1 if debug else int(os.getenv("WORKERS", "1")),
         log_level="info" if not debug else "debug"
     )
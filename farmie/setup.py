@@ -6,10 +6,91 @@ This script sets up the service with mock models for immediate testing
 
 import os
 import sys
+import argparse
+import shutil
 import subprocess
+import tempfile
+import importlib.util
 from pathlib import Path
 
-def main():
+from app.utils.helpers import REQUIRED_MODEL_FILES
+
+# Platform-specific venv layout, resolved once; executables inside it are
+# looked up with shutil.which, which also applies PATHEXT on Windows
+IS_WIN = os.name == "nt"
+VENV_DIR = Path("venv")
+VENV_BIN = str(VENV_DIR / ("Scripts" if IS_WIN else "bin"))
+VENV_PYTHON = "venv\\Scripts\\python" if IS_WIN else "venv/bin/python"
+
+# Outputs of the sample data step; model outputs are REQUIRED_MODEL_FILES
+SAMPLE_DATA_FILES = (
+    "sample_sensor_data.json", "sample_batch_data.json", "sample_feedback_data.json",
+)
+
+def venv_command():
+    """Pick the fastest available virtual environment creator.
+
+    uv and virtualenv (app-data seeder) reuse pre-unpacked wheels instead of
+    bootstrapping pip through ensurepip; the stdlib venv is the fallback.
+    """
+    uv = shutil.which("uv")
+    if uv:
+        # --seed installs pip so the install step below works unchanged
+        return [uv, "venv", "--seed", "--python", sys.executable, "venv"]
+    if importlib.util.find_spec("virtualenv") is not None:
+        return [sys.executable, "-m", "virtualenv", "--seeder=app-data", "venv"]
+    return [sys.executable, "-m", "venv", "venv"]
+
+def missing_outputs(directory, filenames):
+    """Return the filenames not present in directory, using a single scan"""
+    try:
+        with os.scandir(directory) as it:
+            present = {entry.name for entry in it}
+    except FileNotFoundError:
+        return list(filenames)
+    return [name for name in filenames if name not in present]
+
+def run_steps(python_exe, steps, parallel=True):
+    """Run (intro, script, ok_msg, fail_msg) steps, concurrently if parallel.
+
+    Each step's stderr goes to its own temp file so failures stay attributable.
+    """
+    if not parallel:
+        for intro, script, ok_msg, fail_msg in steps:
+            print(f"\n{intro}")
+            try:
+                subprocess.run([python_exe, script], check=True)
+                print(ok_msg)
+            except subprocess.CalledProcessError as e:
+                print(f"{fail_msg}: {e}")
+                return False
+        return True
+    
+    running = []
+    for intro, script, ok_msg, fail_msg in steps:
+        print(f"\n{intro}")
+        err = tempfile.TemporaryFile()
+        running.append((subprocess.Popen([python_exe, script], stderr=err), err, script, ok_msg, fail_msg))
+    
+    ok = True
+    for proc, err, script, ok_msg, fail_msg in running:
+        returncode = proc.wait()
+        if returncode == 0:
+            print(ok_msg)
+        else:
+            ok = False
+            err.seek(0)
+            print(f"{fail_msg}: {script} exited with status {returncode}")
+            print(err.read().decode(errors="replace"))
+        err.close()
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quick setup for Farm IoT Monitoring Service")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate models and sample data even if they already exist")
+    args = parser.parse_args(argv)
+    
     print("🌱 Farm IoT Monitoring Service - Quick Setup")
     print("=" * 50)
     
@@ -19,38 +100,56 @@ def main():
         return
     
     # Check if virtual environment exists
-    venv_path = Path("venv")
-    if not venv_path.exists():
+    if not VENV_DIR.exists():
         print("📦 Creating virtual environment...")
         try:
-            subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+            subprocess.run(venv_command(), check=True)
             print("✅ Virtual environment created")
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to create virtual environment: {e}")
             return
     
-    # Determine Python executable
-    if os.name == 'nt':  # Windows
-        python_exe = venv_path / "Scripts" / "python.exe"
-        pip_exe = venv_path / "Scripts" / "pip.exe"
-    else:  # Unix/Linux/macOS
-        python_exe = venv_path / "bin" / "python"
-        pip_exe = venv_path / "bin" / "pip"
+    # Resolve the venv's executables once; every later step reuses them
+    python_exe = shutil.which("python", path=VENV_BIN)
+    pip_exe = shutil.which("pip", path=VENV_BIN)
+    if python_exe is None or pip_exe is None:
+        print(f"❌ python/pip not found in {VENV_BIN}; delete {VENV_DIR} and re-run setup")
+        return
     
     print("📦 Installing lightweight dependencies...")
+    # One resolver run for the whole set; prefer wheels over building sdists.
+    # pip's stdout is discarded and only stderr is kept for error reporting.
+    pip_install = [pip_exe, "install", "--prefer-binary", "--disable-pip-version-check"]
+    
+    # Reuse the download cache across setup runs
+    # (an unresolvable or read-only home just means installing without it)
+    try:
+        xdg_cache = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        cache_dir = Path(os.environ.get("PIP_CACHE_DIR") or xdg_cache / "pip")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        pip_install += ["--cache-dir", str(cache_dir)]
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️  pip cache directory unavailable, installing without it: {e}")
+    
+    # Prefer wheels from a local wheelhouse when one has been prepared
+    wheelhouse = Path("wheelhouse")
+    if wheelhouse.is_dir():
+        pip_install += ["--find-links", str(wheelhouse)]
+    quiet = {"stdout": subprocess.DEVNULL, "stderr": subprocess.PIPE}
+    
     try:
-        subprocess.run([str(pip_exe), "install", "-r", "requirements.txt"], 
-                      check=True, capture_output=True)
+        subprocess.run(pip_install + ["-r", "requirements.txt"], check=True, **quiet)
         print("✅ Dependencies installed successfully")
     except subprocess.CalledProcessError as e:
         print(f"⚠️  Failed to install full requirements, trying minimal set...")
+        print(e.stderr.decode(errors="replace"))
         try:
-            subprocess.run([str(pip_exe), "install", "-r", "requirements-minimal.txt"], 
-                          check=True, capture_output=True)
+            subprocess.run(pip_install + ["-r", "requirements-minimal.txt"], check=True, **quiet)
             print("✅ Minimal dependencies installed successfully")
             print("ℹ️  LLM features will use fallback mode")
         except subprocess.CalledProcessError as e2:
             print(f"❌ Failed to install even minimal dependencies: {e2}")
+            print(e2.stderr.decode(errors="replace"))
             print("\n🔧 Manual installation options:")
             print("1. Install system dependencies:")
             print("   sudo pacman -S python-pip python-venv")
@@ -62,36 +161,30 @@ def main():
             print("   conda install fastapi uvicorn pydantic")
             return
     
-    print("\n🤖 Generating mock ML models...")
-    try:
-        subprocess.run([str(python_exe), "app/models/train.py"], check=True)
-        print("✅ Mock models generated successfully")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to generate models: {e}")
-        return
-    
-    print("\n📊 Generating sample data...")
-    try:
-        subprocess.run([str(python_exe), "data/generate_sample_data.py"], check=True)
-        print("✅ Sample data generated successfully")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to generate sample data: {e}")
+    # Model training and sample data generation write disjoint files,
+    # so run them side by side when there is more than one CPU
+    steps = []
+    if args.force or missing_outputs("app/models/saved", REQUIRED_MODEL_FILES):
+        steps.append(("🤖 Generating mock ML models...", "app/models/train.py",
+                      "✅ Mock models generated successfully", "❌ Failed to generate models"))
+    else:
+        print("\n✅ Models already present, skipping training (use --force to retrain)")
+    if args.force or missing_outputs("data", SAMPLE_DATA_FILES):
+        steps.append(("📊 Generating sample data...", "data/generate_sample_data.py",
+                      "✅ Sample data generated successfully", "❌ Failed to generate sample data"))
+    else:
+        print("✅ Sample data already present, skipping generation (use --force to regenerate)")
+    if steps and not run_steps(python_exe, steps, parallel=(os.cpu_count() or 1) >= 2):
         return
     
     print("\n🎉 Setup completed successfully!")
     print("\n🚀 To start the service:")
     print("   cd farmie")
-    if os.name == 'nt':  # Windows
-        print("   venv\\Scripts\\python run.py")
-    else:  # Unix/Linux/macOS
-        print("   venv/bin/python run.py")
+    print(f"   {VENV_PYTHON} run.py")
     print("\n📖 To view API documentation:")
     print("   Visit http://localhost:8000/docs")
     print("\n🧪 To run tests:")
-    if os.name == 'nt':  # Windows
-        print("   venv\\Scripts\\python test_api.py")
-    else:  # Unix/Linux/macOS
-        print("   venv/bin/python test_api.py")
+    print(f"   {VENV_PYTHON} test_api.py")
     
     print("\n📝 Note: This setup uses mock ML models.")
     print("   For production use, replace the .pkl files in app/models/saved/")
@@ -5,11 +5,67 @@ This script helps you get started with the Farm IoT Monitoring Service
 """
 
 import os
+import re
 import sys
+import json
+import hashlib
+import runpy
+import argparse
 import subprocess
 import time
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
+from app.utils.helpers import REQUIRED_MODEL_FILES
+
+# Placeholder values left in .env by .env.example
+_PLACEHOLDERS = {
+    f"your_{name}_api_key_here": name for name in ("openai", "google", "openweather")
+}
+
+# Optional Aho-Corasick automaton over the placeholders; the compiled regex
+# alternation is also a single pass and is used when pyahocorasick is missing
+try:
+    import ahocorasick
+    _PLACEHOLDER_AUTOMATON = ahocorasick.Automaton()
+    for needle, name in _PLACEHOLDERS.items():
+        _PLACEHOLDER_AUTOMATON.add_word(needle, name)
+    _PLACEHOLDER_AUTOMATON.make_automaton()
+except ImportError:
+    _PLACEHOLDER_AUTOMATON = None
+_PLACEHOLDER_RE = re.compile("|".join(map(re.escape, _PLACEHOLDERS)))
+
+def _find_placeholders(content):
+    """Return the names of all placeholders present in content"""
+    if _PLACEHOLDER_AUTOMATON is not None:
+        return {name for _, name in _PLACEHOLDER_AUTOMATON.iter(content)}
+    return {_PLACEHOLDERS[match] for match in _PLACEHOLDER_RE.findall(content)}
+
+# Passing env/model check results, keyed by the mtimes of the files they read
+CHECK_CACHE_FILE = Path(".farmie_cache.json")
+
+# Returned by a check that passed but printed warnings; such results are not
+# cached so the warnings keep showing on every run
+PASSED_WITH_WARNINGS = "passed with warnings"
+
+MODELS_DIR = Path("app/models/saved")
+
+def _check_signature(check_name, paths):
+    """Hash the check name with the mtime of each path; None if any is missing"""
+    try:
+        stamps = [(str(path), os.stat(path).st_mtime_ns) for path in paths]
+    except FileNotFoundError:
+        return None
+    return hashlib.sha256(json.dumps([check_name, stamps]).encode()).hexdigest()
+
+def _load_check_cache():
+    """Load cached check results, treating a missing or corrupt file as empty"""
+    try:
+        with open(CHECK_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -29,18 +85,25 @@ def check_dependencies():
     ]
     
     missing_packages = []
+    lines = []
     
+    # Look up installed distribution metadata instead of importing each package
     for package in required_packages:
         try:
-            __import__(package.replace('-', '_'))
-            print(f"✅ {package}")
-        except ImportError:
-            print(f"❌ {package}")
+            distribution(package)
+            lines.append(f"✅ {package}")
+        except PackageNotFoundError:
+            lines.append(f"❌ {package}")
             missing_packages.append(package)
     
     if missing_packages:
-        print(f"\n📦 Missing packages: {', '.join(missing_packages)}")
-        print("   Install with: pip install -r requirements.txt")
+        lines.append(f"\n📦 Missing packages: {', '.join(missing_packages)}")
+        lines.append("   Install with: pip install -r requirements.txt")
+    
+    # Emit the whole report in one write
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    if missing_packages:
         return False
     
     return True
@@ -49,7 +112,14 @@ def check_env_file():
     """Check if .env file exists and is configured"""
     env_file = Path(".env")
     
-    if not env_file.exists():
+    # Opening the file doubles as the existence check; it is streamed line by
+    # line and each line goes through the single-pass placeholder scan
+    found = set()
+    try:
+        with open(env_file, 'r') as f:
+            for line in f:
+                found |= _find_placeholders(line)
+    except FileNotFoundError:
         print("❌ .env file not found")
         print("   Copy .env.example to .env and configure your API keys")
         return False
@@ -57,45 +127,34 @@ def check_env_file():
     print("✅ .env file found")
     
     # Check if API keys are configured
-    with open(env_file, 'r') as f:
-        content = f.read()
-        
-    if 'your_openai_api_key_here' in content:
+    if "openai" in found:
         print("⚠️  OpenAI API key not configured")
     else:
         print("✅ OpenAI API key configured")
         
-    if 'your_google_api_key_here' in content:
+    if "google" in found:
         print("⚠️  Google API key not configured")
     else:
         print("✅ Google API key configured")
         
-    if 'your_openweather_api_key_here' in content:
+    if "openweather" in found:
         print("⚠️  OpenWeather API key not configured")
     else:
         print("✅ OpenWeather API key configured")
     
-    return True
+    return PASSED_WITH_WARNINGS if found else True
 
 def check_models():
     """Check if ML models are trained"""
-    models_dir = Path("app/models/saved")
-    
-    if not models_dir.exists():
+    # One directory scan instead of a stat per file
+    try:
+        with os.scandir(MODELS_DIR) as it:
+            present = {entry.name for entry in it}
+    except FileNotFoundError:
         print("❌ Models directory not found")
         return False
     
-    required_files = [
-        "irrigation_model.pkl",
-        "crop_health_model.pkl", 
-        "yield_model.pkl",
-        "model_metadata.pkl"
-    ]
-    
-    missing_models = []
-    for file in required_files:
-        if not (models_dir / file).exists():
-            missing_models.append(file)
+    missing_models = [file for file in REQUIRED_MODEL_FILES if file not in present]
     
     if missing_models:
         print(f"⚠️  Missing model files: {', '.join(missing_models)}")
@@ -130,16 +189,10 @@ def generate_sample_data():
     """Generate sample data for testing"""
     print("📊 Generating sample data...")
     try:
-        result = subprocess.run([
-            sys.executable, "data/generate_sample_data.py"
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print("✅ Sample data generated")
-            return True
-        else:
-            print(f"❌ Sample data generation failed: {result.stderr}")
-            return False
+        # Plain file writes; no isolation needed, so skip a second interpreter
+        runpy.run_path("data/generate_sample_data.py", run_name="__main__")
+        print("✅ Sample data generated")
+        return True
     except Exception as e:
         print(f"❌ Sample data generation error: {e}")
         return False
@@ -153,33 +206,61 @@ def start_service():
     print()
     
     try:
-        subprocess.run([
-            sys.executable, "app/main.py"
-        ])
+        # uvicorn blocks until shutdown, so run it in this interpreter
+        runpy.run_path("app/main.py", run_name="__main__")
     except KeyboardInterrupt:
         print("\n👋 Service stopped")
     except Exception as e:
         print(f"❌ Service error: {e}")
 
-def main():
+# Menu choices by --action name
+ACTIONS = {"start": "1", "train": "2", "data": "3", "test": "4", "exit": "5"}
+
+def main(argv=None):
     """Main startup function"""
+    parser = argparse.ArgumentParser(description="Farm IoT Monitoring Service startup helper")
+    parser.add_argument("--action", choices=list(ACTIONS),
+                        help="run this action after the checks instead of showing the menu")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"ignore {CHECK_CACHE_FILE} and re-run every check")
+    args = parser.parse_args(argv)
+    
     print("🌱 Farm IoT Monitoring Service - Startup")
     print("=" * 50)
     
-    # Check prerequisites
+    # Check prerequisites; file-based checks list the paths whose mtimes
+    # key their cached result
     checks = [
-        ("Python Version", check_python_version),
-        ("Dependencies", check_dependencies),
-        ("Environment File", check_env_file),
-        ("ML Models", check_models)
+        ("Python Version", check_python_version, None),
+        ("Dependencies", check_dependencies, None),
+        ("Environment File", check_env_file, [Path(".env")]),
+        ("ML Models", check_models, [MODELS_DIR] + [MODELS_DIR / f for f in REQUIRED_MODEL_FILES])
     ]
     
+    cache = {} if args.no_cache else _load_check_cache()
+    fresh_cache = {}
     all_passed = True
-    for check_name, check_func in checks:
+    for check_name, check_func, paths in checks:
         print(f"\n📋 {check_name}")
         print("-" * 20)
-        if not check_func():
+        signature = _check_signature(check_name, paths) if paths else None
+        if signature is not None and cache.get(signature):
+            print("✅ (cached)")
+            fresh_cache[signature] = True
+            continue
+        result = check_func()
+        if not result:
             all_passed = False
+        elif result is True and signature is not None:
+            fresh_cache[signature] = True
+    
+    # Only entries matching the current files are kept, so stale ones drop out
+    if fresh_cache != cache:
+        try:
+            with open(CHECK_CACHE_FILE, 'w') as f:
+                json.dump(fresh_cache, f)
+        except OSError:
+            pass
     
     if not all_passed:
         print("\n⚠️  Some checks failed. Please fix the issues above.")
@@ -191,15 +272,18 @@ def main():
     
     print("\n✅ All checks passed!")
     
-    # Ask user what to do
-    print("\n🎯 What would you like to do?")
-    print("1. Start the service")
-    print("2. Train models")
-    print("3. Generate sample data")
-    print("4. Run tests")
-    print("5. Exit")
-    
-    choice = input("\nEnter your choice (1-5): ").strip()
+    if args.action:
+        choice = ACTIONS[args.action]
+    else:
+        # Ask user what to do
+        print("\n🎯 What would you like to do?")
+        print("1. Start the service")
+        print("2. Train models")
+        print("3. Generate sample data")
+        print("4. Run tests")
+        print("5. Exit")
+        
+        choice = input("\nEnter your choice (1-5): ").strip()
     
     if choice == "1":
         start_service()
@@ -209,7 +293,8 @@ def main():
         generate_sample_data()
     elif choice == "4":
         print("🧪 Running tests...")
-        subprocess.run([sys.executable, "test_api.py"])
+        import test_api
+        test_api.run_all_tests()
     elif choice == "5":
         print("👋 Goodbye!")
     else:
@@ -5,222 +5,244 @@ Run this script to test the API endpoints with sample data
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import io
 import json
-import time
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
 import os
 
 # Configuration
 BASE_URL = "http://localhost:8000"
 TIMEOUT = 10
 
-def test_health_check():
-    """Test the health check endpoint"""
-    print("🔍 Testing health check...")
-    try:
-        response = requests.get(f"{BASE_URL}/health", timeout=TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Health check passed: {data['data']['status']}")
-            return True
-        else:
-            print(f"❌ Health check failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Health check error: {e}")
-        return False
+# Optional fast JSON encoding/decoding
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
 
-def test_root_endpoint():
-    """Test the root endpoint"""
-    print("🔍 Testing root endpoint...")
-    try:
-        response = requests.get(f"{BASE_URL}/", timeout=TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Root endpoint: {data['message']}")
-            return True
-        else:
-            print(f"❌ Root endpoint failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Root endpoint error: {e}")
-        return False
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_sensor_data():
-    """Test sensor data endpoint"""
-    print("🔍 Testing sensor data endpoint...")
-    
-    # Sample sensor data
-    sensor_data = {
-        "sensor_id": "test_temp_001",
-        "sensor_type": "dht_temperature",
-        "value": 25.5,
-        "timestamp": datetime.utcnow().isoformat(),
-        "location": "test_field",
-        "metadata": {
-            "battery_level": 95.0,
-            "signal_strength": 85.0
-        }
+# Fixed part of the sample sensor payload; each call adds value and timestamp
+_SENSOR_TEMPLATE = MappingProxyType({
+    "sensor_id": "test_temp_001",
+    "sensor_type": "dht_temperature",
+    "location": "test_field",
+    "metadata": {
+        "battery_level": 95.0,
+        "signal_strength": 85.0
     }
-    
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/sensors/data",
-            json=sensor_data,
-            timeout=TIMEOUT
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Sensor data processed: {data['message']}")
-            print(f"   Predictions: {len(data['data']['predictions'])} models")
-            print(f"   Insights: {len(data['data']['insights'])} generated")
-            return True
-        else:
-            print(f"❌ Sensor data failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            return False
-    except Exception as e:
-        print(f"❌ Sensor data error: {e}")
-        return False
+})
 
-def test_batch_sensor_data():
-    """Test batch sensor data endpoint"""
-    print("🔍 Testing batch sensor data endpoint...")
-    
-    batch_data = {
+# Keep-alive session shared by every test: one host, up to 16 pooled
+# connections for concurrent requests, and no silent retries
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=Retry(total=0)))
+SESSION.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+
+# Request payloads and endpoint checks, shared with test_api_async.py
+
+def sensor_payload():
+    """Sample single sensor reading"""
+    return {**_SENSOR_TEMPLATE, "value": 25.5, "timestamp": datetime.utcnow().isoformat()}
+
+def batch_payload():
+    """Sample batch of readings sharing one timestamp, as a real gateway would send"""
+    ts = datetime.utcnow().isoformat()
+    return {
         "farm_id": "test_farm_001",
         "sensors": [
             {
                 "sensor_id": "test_temp_001",
                 "sensor_type": "dht_temperature",
                 "value": 25.5,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": ts,
                 "location": "test_field_a"
             },
             {
                 "sensor_id": "test_humid_001", 
                 "sensor_type": "dht_humidity",
                 "value": 65.2,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": ts,
                 "location": "test_field_a"
             },
             {
                 "sensor_id": "test_moist_001",
                 "sensor_type": "soil_moisture", 
                 "value": 45.8,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": ts,
                 "location": "test_field_a"
             }
         ]
     }
-    
+
+def feedback_payload():
+    """Sample user feedback on a prediction"""
+    return {
+        "feedback_id": "test_feedback_001",
+        "sensor_data_id": "test_sensor_001",
+        "prediction_id": "test_pred_001",
+        "user_rating": 4,
+        "feedback_text": "Test feedback - prediction was helpful",
+        "is_correct": True,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+# Single-request checks: label for failure messages, method, path, payload
+# factory (None for GET) and the report lines for a successful JSON body
+EndpointCheck = namedtuple("EndpointCheck", "label method path payload report")
+
+HEALTH_CHECK = EndpointCheck("Health check", "GET", "/health", None, lambda data: [
+    f"✅ Health check passed: {data['data']['status']}",
+])
+ROOT_CHECK = EndpointCheck("Root endpoint", "GET", "/", None, lambda data: [
+    f"✅ Root endpoint: {data['message']}",
+])
+SENSOR_CHECK = EndpointCheck("Sensor data", "POST", "/api/sensors/data", sensor_payload, lambda data: [
+    f"✅ Sensor data processed: {data['message']}",
+    f"   Predictions: {len(data['data']['predictions'])} models",
+    f"   Insights: {len(data['data']['insights'])} generated",
+])
+BATCH_CHECK = EndpointCheck("Batch data", "POST", "/api/sensors/batch", batch_payload, lambda data: [
+    f"✅ Batch data processed: {data['message']}",
+    f"   Processed sensors: {data['data']['processed_count']}",
+])
+CONFIG_CHECK = EndpointCheck("Configuration", "GET", "/config", None, lambda data: [
+    f"✅ Configuration retrieved: {data['data']['app_name']}",
+    f"   Debug mode: {data['data']['debug']}",
+    f"   Weather API configured: {data['data']['weather_api_configured']}",
+])
+
+WEATHER_ENDPOINTS = [
+    ("/api/weather/current", "Current weather"),
+    ("/api/weather/forecast?days=3", "Weather forecast"),
+    ("/api/weather/summary", "Weather summary"),
+    ("/api/weather/air-quality", "Air quality")
+]
+
+def check_result(check, status_code, content, text):
+    """Turn an endpoint check's response into (passed, report lines)"""
+    if status_code != 200:
+        lines = [f"❌ {check.label} failed: {status_code}"]
+        if check.method == "POST":
+            lines.append(f"   Error: {text}")
+        return False, lines
+    return True, check.report(_json_loads(content))
+
+def _run_check(check, out):
+    """Run one EndpointCheck over the shared session and print its report"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/sensors/batch",
-            json=batch_data,
-            timeout=TIMEOUT
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Batch data processed: {data['message']}")
-            print(f"   Processed sensors: {data['data']['processed_count']}")
-            return True
+        payload = check.payload() if check.payload else None
+        if payload is None:
+            response = SESSION.get(f"{BASE_URL}{check.path}", timeout=TIMEOUT)
         else:
-            print(f"❌ Batch data failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            return False
+            response = SESSION.post(
+                f"{BASE_URL}{check.path}",
+                data=_json_dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=TIMEOUT
+            )
+        passed, lines = check_result(check, response.status_code, response.content, response.text)
     except Exception as e:
-        print(f"❌ Batch data error: {e}")
-        return False
+        passed, lines = False, [f"❌ {check.label} error: {e}"]
+    print("\n".join(lines), file=out)
+    return passed
 
-def test_weather_endpoints():
+# Each test prints to `out` (sys.stdout when None), so concurrent runs can
+# give every test its own buffer
+
+def test_health_check(out=None):
+    """Test the health check endpoint"""
+    print("🔍 Testing health check...", file=out)
+    return _run_check(HEALTH_CHECK, out)
+
+def test_root_endpoint(out=None):
+    """Test the root endpoint"""
+    print("🔍 Testing root endpoint...", file=out)
+    return _run_check(ROOT_CHECK, out)
+
+def test_sensor_data(out=None):
+    """Test sensor data endpoint"""
+    print("🔍 Testing sensor data endpoint...", file=out)
+    return _run_check(SENSOR_CHECK, out)
+
+def test_batch_sensor_data(out=None):
+    """Test batch sensor data endpoint"""
+    print("🔍 Testing batch sensor data endpoint...", file=out)
+    return _run_check(BATCH_CHECK, out)
+
+def test_weather_endpoints(out=None):
     """Test weather endpoints"""
-    print("🔍 Testing weather endpoints...")
+    print("🔍 Testing weather endpoints...", file=out)
     
-    endpoints = [
-        ("/api/weather/current", "Current weather"),
-        ("/api/weather/forecast?days=3", "Weather forecast"),
-        ("/api/weather/summary", "Weather summary"),
-        ("/api/weather/air-quality", "Air quality")
-    ]
-    
-    success_count = 0
-    for endpoint, description in endpoints:
+    def check(endpoint):
         try:
-            response = requests.get(f"{BASE_URL}{endpoint}", timeout=TIMEOUT)
-            if response.status_code == 200:
-                print(f"✅ {description}: OK")
-                success_count += 1
-            else:
-                print(f"❌ {description}: Failed ({response.status_code})")
+            response = SESSION.get(f"{BASE_URL}{endpoint}", timeout=TIMEOUT)
+            return response.status_code == 200, f"Failed ({response.status_code})"
         except Exception as e:
-            print(f"❌ {description}: Error ({e})")
+            return False, f"Error ({e})"
+    
+    # Fire all requests at once; report in the listed order
+    with ThreadPoolExecutor(max_workers=len(WEATHER_ENDPOINTS)) as executor:
+        outcomes = list(executor.map(check, [endpoint for endpoint, _ in WEATHER_ENDPOINTS]))
+    
+    success_count = 0
+    for (_, description), (ok, detail) in zip(WEATHER_ENDPOINTS, outcomes):
+        if ok:
+            print(f"✅ {description}: OK", file=out)
+            success_count += 1
+        else:
+            print(f"❌ {description}: {detail}", file=out)
     
-    return success_count == len(endpoints)
+    return success_count == len(WEATHER_ENDPOINTS)
 
-def test_feedback_endpoints():
+def test_feedback_endpoints(out=None):
     """Test feedback endpoints"""
-    print("🔍 Testing feedback endpoints...")
-    
-    # Test feedback submission
-    feedback_data = {
-        "feedback_id": "test_feedback_001",
-        "sensor_data_id": "test_sensor_001",
-        "prediction_id": "test_pred_001",
-        "user_rating": 4,
-        "feedback_text": "Test feedback - prediction was helpful",
-        "is_correct": True,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    print("🔍 Testing feedback endpoints...", file=out)
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback/submit",
-            json=feedback_data,
+            data=_json_dumps(feedback_payload()),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Feedback submitted: {data['message']}")
+            data = _json_loads(response.content)
+            print(f"✅ Feedback submitted: {data['message']}", file=out)
             
             # Test feedback retrieval
-            response = requests.get(f"{BASE_URL}/api/feedback/analytics", timeout=TIMEOUT)
+            response = SESSION.get(f"{BASE_URL}/api/feedback/analytics", timeout=TIMEOUT)
             if response.status_code == 200:
-                print("✅ Feedback analytics: OK")
+                print("✅ Feedback analytics: OK", file=out)
                 return True
             else:
-                print("❌ Feedback analytics: Failed")
+                print("❌ Feedback analytics: Failed", file=out)
                 return False
         else:
-            print(f"❌ Feedback submission failed: {response.status_code}")
+            print(f"❌ Feedback submission failed: {response.status_code}", file=out)
             return False
     except Exception as e:
-        print(f"❌ Feedback error: {e}")
+        print(f"❌ Feedback error: {e}", file=out)
         return False
 
-def test_configuration():
+def test_configuration(out=None):
     """Test configuration endpoint"""
-    print("🔍 Testing configuration endpoint...")
-    try:
-        response = requests.get(f"{BASE_URL}/config", timeout=TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Configuration retrieved: {data['data']['app_name']}")
-            print(f"   Debug mode: {data['data']['debug']}")
-            print(f"   Weather API configured: {data['data']['weather_api_configured']}")
-            return True
-        else:
-            print(f"❌ Configuration failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return False
+    print("🔍 Testing configuration endpoint...", file=out)
+    return _run_check(CONFIG_CHECK, out)
 
-def run_all_tests():
-    """Run all tests"""
+def run_all_tests(jobs=None):
+    """Run all tests, up to `jobs` at a time (TEST_JOBS or a CPU-based default when None)"""
     print("🚀 Starting Farm IoT Monitoring Service Tests")
     print("=" * 50)
     
@@ -234,18 +256,38 @@ def run_all_tests():
         ("Configuration", test_configuration)
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        print(f"\n📋 {test_name}")
-        print("-" * 30)
+    # No fixed delay between tests: the service has no rate limit, and one
+    # that needed backoff should answer 429 rather than rely on client sleeps
+    if jobs is None:
+        jobs = int(os.getenv("TEST_JOBS", min(len(tests), (os.cpu_count() or 1) * 2)))
+    
+    def run_one(test_name, test_func):
+        """Run one test into its own buffer; return (output, (name, passed))"""
+        out = io.StringIO()
+        print(f"\n📋 {test_name}", file=out)
+        print("-" * 30, file=out)
         try:
-            result = test_func()
-            results.append((test_name, result))
+            passed = test_func(out)
         except Exception as e:
-            print(f"❌ {test_name} crashed: {e}")
-            results.append((test_name, False))
-        
-        time.sleep(0.5)  # Small delay between tests
+            print(f"❌ {test_name} crashed: {e}", file=out)
+            passed = False
+        return out.getvalue(), (test_name, passed)
+    
+    results = []
+    if jobs <= 1:
+        for test_name, test_func in tests:
+            output, result = run_one(test_name, test_func)
+            sys.stdout.write(output)
+            results.append(result)
+    else:
+        # Tests are independent HTTP calls; run them concurrently and print
+        # each one's output as a block, in the listed order
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(run_one, test_name, test_func) for test_name, test_func in tests]
+            for future in futures:
+                output, result = future.result()
+                sys.stdout.write(output)
+                results.append(result)
     
     # Summary
     print("\n" + "=" * 50)
@@ -269,14 +311,23 @@ def run_all_tests():
     return passed == total
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test the Farm IoT Monitoring Service API")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="start immediately without waiting for Enter")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of tests to run at once (default: TEST_JOBS or 2x CPU count; 1 runs them in order)")
+    args = parser.parse_args()
+    
     print("Farm IoT Monitoring Service - Test Suite")
     print("Make sure the service is running on http://localhost:8000")
     print("Start the service with: python app/main.py")
     print()
     
-    input("Press Enter to start tests...")
+    # Only prompt when a person is at the terminal
+    if not args.yes and sys.stdin.isatty():
+        input("Press Enter to start tests...")
     
-    success = run_all_tests()
+    success = run_all_tests(args.jobs)
     
     if success:
         print("\n🔗 Next steps:")
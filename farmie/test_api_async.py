@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Async test script for Farm IoT Monitoring Service
+Runs the same endpoint checks as test_api.py, all in flight at once over a
+single httpx.AsyncClient. Preferred entrypoint for benchmarking the service.
+"""
+
+import asyncio
+import sys
+import time
+from typing import List, Tuple
+
+import httpx
+
+from test_api import (
+    BASE_URL, TIMEOUT, BATCH_CHECK, CONFIG_CHECK, HEALTH_CHECK, ROOT_CHECK, SENSOR_CHECK,
+    WEATHER_ENDPOINTS, check_result, feedback_payload,
+)
+
+# Each check returns (passed, report lines) so output can be printed in order.
+# Checks are named check_* rather than test_* so pytest does not collect them.
+Result = Tuple[bool, List[str]]
+
+
+async def check_endpoint(client: httpx.AsyncClient, check) -> Result:
+    """Run one of test_api's single-request EndpointChecks"""
+    try:
+        if check.payload is None:
+            response = await client.get(check.path)
+        else:
+            response = await client.post(check.path, json=check.payload())
+        return check_result(check, response.status_code, response.content, response.text)
+    except Exception as e:
+        return False, [f"❌ {check.label} error: {e}"]
+
+
+async def check_weather_endpoints(client: httpx.AsyncClient) -> Result:
+    """Check all weather endpoints concurrently"""
+    responses = await asyncio.gather(
+        *(client.get(endpoint) for endpoint, _ in WEATHER_ENDPOINTS), return_exceptions=True
+    )
+
+    lines = []
+    success_count = 0
+    for (_, description), response in zip(WEATHER_ENDPOINTS, responses):
+        if isinstance(response, Exception):
+            lines.append(f"❌ {description}: Error ({response})")
+        elif response.status_code == 200:
+            lines.append(f"✅ {description}: OK")
+            success_count += 1
+        else:
+            lines.append(f"❌ {description}: Failed ({response.status_code})")
+
+    return success_count == len(WEATHER_ENDPOINTS), lines
+
+
+async def check_feedback_endpoints(client: httpx.AsyncClient) -> Result:
+    """Submit feedback, then read the analytics"""
+    try:
+        response = await client.post("/api/feedback/submit", json=feedback_payload())
+        if response.status_code != 200:
+            return False, [f"❌ Feedback submission failed: {response.status_code}"]
+        lines = [f"✅ Feedback submitted: {response.json()['message']}"]
+
+        # Analytics depend on the submission, so this request stays sequential
+        response = await client.get("/api/feedback/analytics")
+        if response.status_code == 200:
+            return True, lines + ["✅ Feedback analytics: OK"]
+        return False, lines + ["❌ Feedback analytics: Failed"]
+    except Exception as e:
+        return False, [f"❌ Feedback error: {e}"]
+
+
+async def run_all_tests() -> bool:
+    """Run all tests concurrently and print a report in the listed order"""
+    print("🚀 Starting Farm IoT Monitoring Service Tests (async)")
+    print("=" * 50)
+
+    tests = [
+        ("Health Check", lambda client: check_endpoint(client, HEALTH_CHECK)),
+        ("Root Endpoint", lambda client: check_endpoint(client, ROOT_CHECK)),
+        ("Sensor Data", lambda client: check_endpoint(client, SENSOR_CHECK)),
+        ("Batch Sensor Data", lambda client: check_endpoint(client, BATCH_CHECK)),
+        ("Weather Endpoints", check_weather_endpoints),
+        ("Feedback Endpoints", check_feedback_endpoints),
+        ("Configuration", lambda client: check_endpoint(client, CONFIG_CHECK))
+    ]
+
+    # HTTP/2 is negotiated over TLS; against plain http:// httpx uses keep-alive HTTP/1.1
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT, http2=True) as client:
+        outcomes = await asyncio.gather(
+            *(test_func(client) for _, test_func in tests), return_exceptions=True
+        )
+    elapsed = time.perf_counter() - start
+
+    results = []
+    for (test_name, _), outcome in zip(tests, outcomes):
+        print(f"\n📋 {test_name}")
+        print("-" * 30)
+        if isinstance(outcome, Exception):
+            print(f"❌ {test_name} crashed: {outcome}")
+            results.append((test_name, False))
+            continue
+        passed, lines = outcome
+        print("\n".join(lines))
+        results.append((test_name, passed))
+
+    # Summary
+    print("\n" + "=" * 50)
+    print("📊 TEST SUMMARY")
+    print("=" * 50)
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} {test_name}")
+
+    print(f"\n🎯 Results: {passed}/{total} tests passed in {elapsed:.2f}s")
+
+    return passed == total
+
+
+if __name__ == "__main__":
+    print("Farm IoT Monitoring Service - Async Test Suite")
+    print(f"Make sure the service is running on {BASE_URL}")
+    print()
+
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,174 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.utils import helpers
+from app.utils.helpers import DataProcessor
+
+
+def _readings(values, sensor_type="pressure"):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "sensor_id": f"{sensor_type}_001",
+            "sensor_type": sensor_type,
+            "value": value,
+            "timestamp": (start + timedelta(minutes=i)).isoformat(),
+        }
+        for i, value in enumerate(values)
+    ]
+
+
+def _reference_anomalies(values, window_size=10):
+    """Two-pass window statistics, as detect_anomalies computed them originally"""
+    flagged = []
+    for i in range(window_size, len(values)):
+        window = values[i - window_size:i]
+        mean_val = sum(window) / window_size
+        std_val = (sum((x - mean_val) ** 2 for x in window) / window_size) ** 0.5
+        if std_val > 0 and abs(values[i] - mean_val) > 2 * std_val:
+            flagged.append(i)
+    return flagged
+
+
+@pytest.fixture(params=["numpy", "numba"])
+def rolling_backend(request, monkeypatch):
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        monkeypatch.setattr(helpers, "NUMBA_AVAILABLE", True)
+    else:
+        monkeypatch.setattr(helpers, "NUMBA_AVAILABLE", False)
+    return request.param
+
+
+def test_detect_anomalies_on_large_offset(rolling_backend):
+    rng = random.Random(42)
+    values = [101325 + rng.uniform(-0.5, 0.5) for _ in range(100)]
+    values[60] = 101340.0
+    data = _readings(values)
+
+    anomalies = DataProcessor.detect_anomalies(data)
+
+    flagged = {a["timestamp"] for a in anomalies}
+    assert data[60]["timestamp"] in flagged
+    assert flagged == {data[i]["timestamp"] for i in _reference_anomalies(values)}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_detect_anomalies_ignores_flat_window(rolling_backend, seed):
+    rng = random.Random(seed)
+    values = [20 + rng.uniform(-1, 1) for _ in range(30)] + [20.0] * 10 + [25.0]
+    data = _readings(values)
+
+    anomalies = DataProcessor.detect_anomalies(data)
+
+    flagged = {a["timestamp"] for a in anomalies}
+    assert data[-1]["timestamp"] not in flagged
+
+
+def test_get_data_files_limit_ranks_by_mtime(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = helpers.DataStorage(use_firestore=False)
+    names = [
+        "predictions_20240103_000000.json",
+        "sensor_data_20240101_000000.json",
+        "predictions_20240102_000000.json",
+    ]
+    for age, name in enumerate(reversed(names)):
+        path = tmp_path / "data" / name
+        path.write_text("{}")
+        os.utime(path, (1_700_000_000 + age, 1_700_000_000 + age))
+
+    assert storage.get_data_files(limit=1) == ["predictions_20240103_000000.json"]
+    assert storage.get_data_files(limit=2) == sorted(names[:2])
+    assert storage.get_data_files() == sorted(names)
+
+
+class _FakePipeline:
+    """Stands in for a fitted scaler/model pipeline with 11 features"""
+
+    def _check(self, X):
+        if X.ndim != 2 or X.shape[1] != 11:
+            raise ValueError(f"expected 11 features, got shape {X.shape}")
+
+    def predict(self, X):
+        self._check(X)
+        return np.full(len(X), 70.0)
+
+    def predict_proba(self, X):
+        self._check(X)
+        return np.tile([0.2, 0.8], (len(X), 1))
+
+
+@pytest.fixture
+def model_manager(tmp_path):
+    manager = helpers.ModelManager(models_dir=str(tmp_path))
+    for name in ("irrigation", "crop_health", "yield"):
+        manager.pipelines[name] = _FakePipeline()
+    manager._irr_classes = np.array([0, 1])
+    return manager
+
+
+def test_batch_predictions_accept_a_single_row(model_manager):
+    row = [1.0] * 11
+
+    predictions, confidences = model_manager.predict_irrigation_batch(row)
+    assert predictions.tolist() == [1]
+    assert confidences.tolist() == pytest.approx([0.8])
+    assert model_manager.predict_crop_health_batch(row).tolist() == [70.0]
+    assert model_manager.predict_yield_batch(row).tolist() == [70.0]
+
+
+def test_batch_predictions_on_empty_input(model_manager):
+    predictions, confidences = model_manager.predict_irrigation_batch([])
+    assert len(predictions) == 0 and len(confidences) == 0
+    assert len(model_manager.predict_crop_health_batch(np.empty((0, 11)))) == 0
+    assert len(model_manager.predict_yield_batch([])) == 0
+
+
+def test_batch_predictions_fall_back_on_model_errors(model_manager):
+    bad = [[1.0] * 4, [2.0] * 4]
+
+    predictions, confidences = model_manager.predict_irrigation_batch(bad)
+    assert predictions.tolist() == [0, 0]
+    assert confidences.tolist() == [0.5, 0.5]
+    assert model_manager.predict_crop_health_batch(bad).tolist() == [50.0, 50.0]
+    assert model_manager.predict_yield_batch(bad).tolist() == [2000.0, 2000.0]
+    assert model_manager.predict_yield_batch([["n/a"] * 11]).tolist() == [2000.0]
+
+
+def test_check_alerts_batch_matches_single_reading_checks():
+    manager = helpers.AlertManager()
+    columns = ["temperature", "humidity", "soil_moisture", "soil_temperature"]
+    frame = np.array([
+        [20.0, 50.0, 50.0, 20.0],
+        [2.0, 95.0, 50.0, 20.0],
+        [40.0, 50.0, 10.0, 31.0],
+    ])
+
+    batch = manager.check_alerts_batch(frame, columns)
+
+    assert len(batch) == len(frame)
+    for row, alerts in zip(frame.tolist(), batch):
+        expected = manager.check_alerts(dict(zip(columns, row)))
+        assert sorted((a["sensor_type"], a["type"]) for a in alerts) == \
+            sorted((a["sensor_type"], a["type"]) for a in expected)
+    assert [len(alerts) for alerts in batch] == [0, 2, 3]
+
+
+def test_check_alerts_batch_single_column_and_empty_frame():
+    manager = helpers.AlertManager()
+
+    alerts = manager.check_alerts_batch([3.0, 10.0, 36.0], ["temperature"])
+    assert [[a["type"] for a in row] for row in alerts] == [["low_threshold"], [], ["high_threshold"]]
+    assert manager.check_alerts_batch(np.empty((0, 4))) == []
+    assert manager.check_alerts_batch([], ["humidity"]) == []
+
+
+@pytest.mark.parametrize("columns", [[], ["temperature", "wind_speed"]])
+def test_check_alerts_batch_rejects_bad_columns(columns):
+    with pytest.raises(ValueError):
+        helpers.AlertManager().check_alerts_batch(np.zeros((1, max(len(columns), 1))), columns)